@@ -2,17 +2,15 @@ import asyncio
 import tomllib
 import json
 import argparse
-import time
 import logging
 from os import getenv
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 from dotenv import load_dotenv
-import traceback
-from siren.core import ScraperProto, Local, Drive, File, HTTP
-from siren import SCRAPERS
-from httpx import Timeout, AsyncClient
+from siren.core import ScraperProto, Local, Drive, File, Uploader
+from siren import SCRAPERS, runner
+from siren.runner import RunOptions, WorkerPool, run
 from pydantic import BaseModel
 
 
@@ -37,6 +35,9 @@ class Config(BaseModel):
     timeout: int | None = None
     cloud: Cloud | None = None
     out: str | None = None
+    upload_workers: int = 4
+    compression: Literal["gzip", "zstd"] | None = "gzip"
+    processes: int = 0
 
 
 def strptime(string: str):
@@ -59,6 +60,14 @@ parser.add_argument("--config", default=None)
 parser.add_argument("--days", type=int, default=1)
 parser.add_argument("--cloud", action="store_true")
 parser.add_argument("--root_folder_id", default=None)
+parser.add_argument("--upload-workers", type=int, default=4)
+parser.add_argument(
+    "--compression",
+    choices=["gzip", "zstd", "none"],
+    default="gzip",
+    type=str.lower,
+)
+parser.add_argument("--processes", type=int, default=0)
 
 args = parser.parse_args()
 
@@ -85,6 +94,9 @@ else:
     else:
         args.cloud = None
 
+    if args.compression == "none":
+        args.compression = None
+
     config = Config(**args.__dict__)
 
 
@@ -106,52 +118,77 @@ if config.cloud and config.cloud.enabled:
         root=config.cloud.root_folder_id,
     )
 else:
-    cloud = Local(Path("."))
+    cloud = Local(Path("."), compression=config.compression)
 
 
-async def run_scraper(Scraper: type[ScraperProto[Any]]) -> File | None:
-    start = time.perf_counter()
-    file = None
-    async with AsyncClient(timeout=Timeout(config.timeout)) as client:
-        try:
-            scraper = Scraper(
-                start=config.start,
-                end=config.end,
-                keywords=config.keywords,
-                http=HTTP(client, max_concurrency=config.max_concurrency),
-            )
-            logger.info(f"Scraping {scraper} with keywords: {config.keywords}")
-            file = await scraper.to_file()
-        except Exception as e:
-            logger.error("\n".join(traceback.format_exception(e)))
-    end = time.perf_counter()
-    logger.info(f"{Scraper.__name__} completed in {end - start}s.")
+options = RunOptions(
+    start=config.start,
+    end=config.end,
+    keywords=config.keywords,
+    timeout=config.timeout,
+    max_concurrency=config.max_concurrency,
+)
+
+
+async def run_scraper(
+    Scraper: type[ScraperProto[Any]], uploader: Uploader | None = None
+) -> File | None:
+    """Run a scraper and hand its file to `uploader`, if given, as soon as it is ready."""
+    file = await runner.run_scraper(Scraper, options)
+    if file and uploader:
+        uploader.submit(file)
     return file
 
 
-async def run_all():
-    tasks: list[asyncio.Task[File | None]] = []
-    for _, Scraper in SCRAPERS.items():
-        tasks.append(asyncio.create_task(run_scraper(Scraper)))
-    for file in asyncio.as_completed(tasks):
-        if f := await file:
-            cloud.upload(f)
+async def run_placed(
+    pool: WorkerPool, name: str, Scraper: type[ScraperProto[Any]], uploader: Uploader
+) -> File | None:
+    """Run a scraper in a worker process and hand its file to `uploader`."""
+    try:
+        file = await pool.scrape(name, Scraper, options)
+    except Exception as e:
+        logger.error(f"Ignoring exception from the worker running {name}: {e!r}")
+        return None
+    if file:
+        uploader.submit(file)
+    return file
 
 
-try:
-    import uvloop
+async def run_one(Scraper: type[ScraperProto[Any]]):
+    async with Uploader(cloud, workers=config.upload_workers) as uploader:
+        await run_scraper(Scraper, uploader)
 
-    run = uvloop.run
-except ModuleNotFoundError:
-    import asyncio
 
-    run = asyncio.run
+async def run_all():
+    scrapers = {
+        name: Scraper
+        for name, Scraper in SCRAPERS.items()
+        if getattr(Scraper, "RUN_ALL", True)
+    }
+    folders = [Scraper.__name__ for Scraper in scrapers.values()]
+    # workers are forked here, before the folder and upload threads start
+    pool = WorkerPool(config.processes, scrapers.values()) if config.processes > 0 else None
+    try:
+        try:
+            await asyncio.to_thread(cloud.create_folders, folders)
+        except Exception as e:
+            logger.error(f"Ignoring exception while creating folders: {e}")
+        async with Uploader(cloud, workers=config.upload_workers) as uploader:
+            tasks: list[asyncio.Task[File | None]] = []
+            for name, Scraper in scrapers.items():
+                if pool and pool.places(Scraper):
+                    coro = run_placed(pool, name, Scraper, uploader)
+                else:
+                    coro = run_scraper(Scraper, uploader)
+                tasks.append(asyncio.create_task(coro))
+            await asyncio.gather(*tasks)
+    finally:
+        if pool:
+            pool.close()
 
 if __name__ == "__main__":
     if Scraper := SCRAPERS.get(config.scraper):
-        file = run(run_scraper(Scraper))
-        if file:
-            cloud.upload(file)
+        run(run_one(Scraper))
 
     elif config.scraper == "all":
         run(run_all())
@@ -3,6 +3,11 @@ from .cloud import CloudProto, Drive, Local
 from .model import Model
 from .http import ClientProto, ResponseProto, HTTP
 from .scraper import ScraperProto, BaseScraper
+from .pipeline import Pipeline
+from .cache import cache_dir
+from .scheduler import Scheduler
+from .pagination import Paginator
+from .upload import Uploader, UploadStats
 
 __all__ = (
     "File",
@@ -15,4 +20,10 @@ __all__ = (
     "ScraperProto",
     "BaseScraper",
     "HTTP",
+    "Pipeline",
+    "cache_dir",
+    "Scheduler",
+    "Paginator",
+    "Uploader",
+    "UploadStats",
 )
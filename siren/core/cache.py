@@ -0,0 +1,15 @@
+from os import getenv
+from pathlib import Path
+
+__all__ = ("cache_dir",)
+
+
+def cache_dir(*parts: str) -> Path:
+    """
+    Return (and create) a directory for on-disk caches and stores.
+
+    The root defaults to `.siren` in the working directory and can be moved with the `SIREN_CACHE_DIR` environment variable.
+    """
+    path = Path(getenv("SIREN_CACHE_DIR", ".siren"), *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,11 +1,27 @@
+import csv
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from logging import getLogger
 from pathlib import Path
-from typing import Any, Protocol
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
+from collections.abc import Iterator
+from typing import IO, Any, ClassVar, Literal, Protocol
 from pydantic import BaseModel
 
-from .file import File
+from .cache import cache_dir
+from .file import File, atomic_writer
+
+logger = getLogger(__name__)
+
+try:
+    import zstandard  # pyright: ignore[reportMissingImports]
+except ModuleNotFoundError:
+    zstandard = None
+
+type Compression = Literal["gzip", "zstd"] | None
 
 
 # TODO: pray to god and fix types
@@ -19,6 +35,8 @@ class CloudProto(Protocol):
 
     def create_folder(self, folder: str, parent: str) -> Any: ...
 
+    def create_folders(self, folders: list[str]) -> Any: ...
+
 
 class DriveFile(BaseModel):
     kind: str
@@ -28,66 +46,349 @@ class DriveFile(BaseModel):
 
 
 class Drive(CloudProto):
-    def __init__(self, creds: dict[str, str], root: str):
+    """
+    Uploads files to Google Drive, into one folder per scraper under `root`.
+
+    The underlying HTTP transport is not thread-safe, so every thread gets its own service object,
+    which lets :class:`Uploader` run several uploads at once.
+
+    The IDs of the per-scraper folders are kept in an on-disk index, so startup makes no API calls;
+    the index is rebuilt from Drive only when a folder is missing from it.
+
+    Files are sent in resumable chunks, and a file whose MD5 matches the `md5Checksum` of the file
+    of the same name already in the folder is not uploaded again.
+
+    Parameters
+    ----------
+
+    creds: :class:`dict[str, str]`
+        The service account credentials.
+
+    root: :class:`str`
+        The ID of the folder to upload into.
+
+    service: :class:`Any`
+        A Drive v3 service object to use instead of building one from `creds`, e.g. a local stand-in.
+
+    """
+
+    CHUNK_SIZE: ClassVar[int] = 8 * 1024 * 1024
+    """The size of each resumable upload request. Must be a multiple of 256 KiB."""
+
+    MAX_RETRIES: ClassVar[int] = 5
+    """How many times a failed chunk is retried (with exponential backoff) before the upload is abandoned."""
+
+    FOLDER_MIMETYPE: ClassVar[str] = "application/vnd.google-apps.folder"
+
+    def __init__(self, creds: dict[str, str], root: str, *, service: Any = None):
+        # the Google client libraries are slow to import, so they are only loaded once Drive is used
+        from google.oauth2.service_account import Credentials
+
         self.root = root
-        self.creds = Credentials.from_service_account_info(creds)  # type: ignore
-        self.service = build("drive", "v3", credentials=self.creds)
-        self.files: list[DriveFile] = list(
-            map(
-                DriveFile.model_validate,
-                (
-                    self.service.files()
-                    .list(q=f"'{root}' in parents")
-                    .execute()
-                    .get("files", {})
-                ),
-            )
+        self.creds = (
+            Credentials.from_service_account_info(creds)  # type: ignore
+            if service is None
+            else None
         )
-        target_mimetype = "application/vnd.google-apps.folder"
+        self.shared_service = service
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.index_path = cache_dir("drive") / f"{root}.json"
+        self.files: list[DriveFile] = []
+        self.targets: dict[str, str] = self.load_index()
+
+    def load_index(self) -> dict[str, str]:
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.targets, indent=2))
+        tmp.replace(self.index_path)
+
+    def refresh_index(self):
+        """Rebuild the folder index from every page of the root folder's listing."""
+        files: list[DriveFile] = []
+        token = None
+        while True:
+            resp = (
+                self.service.files()
+                .list(
+                    q=f"'{self.root}' in parents and trashed = false",
+                    fields="nextPageToken, files(kind, mimeType, id, name)",
+                    pageSize=1000,
+                    pageToken=token,
+                )
+                .execute()
+            )
+            files.extend(map(DriveFile.model_validate, resp.get("files", [])))
+            if not (token := resp.get("nextPageToken")):
+                break
+        self.files = files
         self.targets = {
-            df.name: df.id for df in self.files if df.mimeType == target_mimetype
+            df.name: df.id for df in files if df.mimeType == self.FOLDER_MIMETYPE
         }
-        # print(dumps(self.files, indent=4))
+        self.save_index()
+
+    @property
+    def service(self) -> Any:
+        if self.shared_service is not None:
+            return self.shared_service
+        if (service := getattr(self.local, "service", None)) is None:
+            from googleapiclient.discovery import build
+
+            service = self.local.service = build(
+                "drive", "v3", credentials=self.creds
+            )
+        return service
 
     def create_folder(self, folder: str, parent: str) -> dict[str, str]:
         body = {
             "name": folder,
-            "mimeType": "application/vnd.google-apps.folder",
+            "mimeType": self.FOLDER_MIMETYPE,
             "parents": [parent],
         }
         return self.service.files().create(body=body, fields="id").execute()
 
-    def upload_file(self, file: File, folder: str) -> dict[str, Any]:
-        body = {"name": file.name, "parents": [folder]}
-        media = MediaIoBaseUpload(file.buffer(), mimetype=file.mimetype)
-        return (
+    def create_folders(self, folders: list[str]):
+        """Make sure a folder exists under `root` for each of `folders`, creating the missing ones in a single batch request."""
+        with self.lock:
+            if missing := [f for f in folders if f not in self.targets]:
+                self.refresh_index()
+            if not (missing := [f for f in folders if f not in self.targets]):
+                return
+
+            def created(request_id: str, response: dict[str, str], exception: Exception | None):
+                if exception:
+                    logger.error(f"Ignoring exception while creating folder {request_id}: {exception}")
+                else:
+                    self.targets[request_id] = response["id"]
+
+            batch = self.service.new_batch_http_request(callback=created)
+            for folder in missing:
+                body = {
+                    "name": folder,
+                    "mimeType": self.FOLDER_MIMETYPE,
+                    "parents": [self.root],
+                }
+                batch.add(
+                    self.service.files().create(body=body, fields="id"),
+                    request_id=folder,
+                )
+            batch.execute()
+            self.save_index()
+
+    def target(self, origin: str, *, refresh: bool = False) -> str:
+        """Return the ID of `origin`'s folder, looking it up on Drive (and creating it) only if it is not indexed."""
+        with self.lock:  # don't create the same folder from two threads
+            if refresh:
+                self.targets.pop(origin, None)
+            if origin not in self.targets:
+                self.refresh_index()
+            if not (target_id := self.targets.get(origin)):
+                folder = self.create_folder(origin, self.root)
+                target_id = self.targets[origin] = folder["id"]
+                self.save_index()
+            return target_id
+
+    @staticmethod
+    def md5(file: File) -> str:
+        digest = hashlib.md5()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def find_file(self, name: str, folder: str) -> dict[str, Any] | None:
+        """Return the ID and `md5Checksum` of the file called `name` in `folder`, if any."""
+        escaped = name.replace("\\", "\\\\").replace("'", "\\'")
+        files = (
             self.service.files()
-            .create(body=body, media_body=media, fields="id")
+            .list(
+                q=f"name = '{escaped}' and '{folder}' in parents and trashed = false",
+                fields="files(id, md5Checksum)",
+            )
             .execute()
+            .get("files", [])
         )
+        return files[0] if files else None
 
-    def upload(self, file: File):
+    def _send(self, request: Any) -> dict[str, Any]:
+        """Send a resumable upload request chunk by chunk, resuming after transient errors."""
+        response = None
+        failures = 0
+        while response is None:
+            try:
+                _status, response = request.next_chunk(num_retries=self.MAX_RETRIES)
+            except (ConnectionError, TimeoutError) as e:
+                failures += 1
+                if failures > self.MAX_RETRIES:
+                    raise
+                logger.warning(f"Retrying upload chunk after {e!r}")
+                time.sleep(2**failures)
+        return response
 
-        origin = file.origin.__class__.__name__
-        if target_id := self.targets.get(origin):
-            self.upload_file(file, target_id)
+    def upload_file(self, file: File, folder: str) -> dict[str, Any]:
+        md5 = self.md5(file)
+        existing = self.find_file(file.name, folder)
+        if existing and existing.get("md5Checksum") == md5:
+            logger.info(f"Skipping upload of {file.name}: unchanged")
+            return existing
+        from googleapiclient.http import MediaIoBaseUpload
+
+        media = MediaIoBaseUpload(
+            file.buffer(),
+            mimetype=file.mimetype,
+            chunksize=self.CHUNK_SIZE,
+            resumable=True,
+        )
+        files = self.service.files()
+        if existing:
+            request = files.update(
+                fileId=existing["id"], media_body=media, fields="id, md5Checksum"
+            )
         else:
-            folder = self.create_folder(origin, self.root)
-            folder_id = folder["id"]
-            self.targets[origin] = folder_id
-            self.upload_file(file, folder_id)
+            body = {"name": file.name, "parents": [folder]}
+            request = files.create(
+                body=body, media_body=media, fields="id, md5Checksum"
+            )
+        response = self._send(request)
+        if (checksum := response.get("md5Checksum")) and checksum != md5:
+            logger.error(f"Checksum mismatch after uploading {file.name}!")
+        return response
+
+    def upload(self, file: File):
+        from googleapiclient.errors import HttpError
+
+        origin = file.origin_name
+        try:
+            self.upload_file(file, self.target(origin))
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            # the indexed folder was deleted on Drive
+            self.upload_file(file, self.target(origin, refresh=True))
 
 
 class Local(CloudProto):
-    def __init__(self, root: Path):
+    """
+    Writes files under `root` in a `<scraper>/date=YYYY-MM-DD/` partition layout.
+
+    Files are compressed while they are streamed to disk and replace any previous version atomically.
+    Every run only touches its own partition, so daily runs add partitions rather than rewriting old ones.
+    A file is partitioned by the start of its scraper's window, which is also the first date in its name;
+    a file covering several days holds rows from all of them.
+    Each scraper folder has a `_manifest.json` listing its partitions and, for every file in them, the row count
+    and the `start` and `end` of the window it covers, so readers can prune by date without opening the files.
+
+    Parameters
+    ----------
+
+    root: :class:`pathlib.Path`
+        The directory to write into.
+
+    compression: :data:`Compression`
+        `"gzip"` (the default), `"zstd"` (requires the `zstandard` package) or `None`.
+
+    """
+
+    SUFFIXES: ClassVar[dict[str | None, str]] = {"gzip": ".gz", "zstd": ".zst", None: ""}
+
+    def __init__(self, root: Path, *, compression: Compression = "gzip"):
         self.root = root
         assert self.root.is_dir()
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self.compression = compression
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def partition(file: File) -> str:
+        """Return the `date=YYYY-MM-DD` partition of `file`: the first day of its scraper's window."""
+        if file.window:
+            day = file.window[0].date()
+        else:
+            day = date.today()
+        return f"date={day.isoformat()}"
+
+    def open(self, f: IO[bytes]) -> IO[bytes]:
+        match self.compression:
+            case "gzip":
+                return gzip.GzipFile(fileobj=f, mode="wb", mtime=0)
+            case "zstd":
+                assert zstandard is not None
+                return zstandard.ZstdCompressor().stream_writer(f, closefd=False)
+            case _:
+                return f
+
+    @staticmethod
+    def lines(file: File) -> Iterator[str]:
+        pending = b""
+        for chunk in file.chunks():
+            *complete, pending = (pending + chunk).split(b"\n")
+            for line in complete:
+                yield line.decode() + "\n"
+        if pending:
+            yield pending.decode()
+
+    def rows(self, file: File) -> int | None:
+        """Return the number of records in a CSV `file`, excluding the header."""
+        if not file.name.endswith(".csv"):
+            return None
+        return max(0, sum(1 for _ in csv.reader(self.lines(file))) - 1)
+
+    def write(self, file: File, path: Path):
+        """Compress `file` into `path` atomically."""
+        with atomic_writer(path) as f:
+            writer = self.open(f)
+            for chunk in file.chunks():
+                writer.write(chunk)
+            if writer is not f:
+                writer.close()
+
+    def update_manifest(self, folder: Path, partition: str, name: str, entry: dict[str, Any]):
+        with self.lock:
+            path = folder / "_manifest.json"
+            try:
+                manifest = json.loads(path.read_text())
+            except (OSError, ValueError):
+                manifest = {"partitions": {}}
+            manifest["partitions"].setdefault(partition, {})[name] = entry
+            manifest["partitions"] = dict(sorted(manifest["partitions"].items()))
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(manifest, indent=2))
+            tmp.replace(path)
 
     def upload_file(self, file: File, folder: str):
-        with open((self.root / file.name), "wb") as f:
-            f.write(file.buffer().read())
+        partition = self.partition(file)
+        start, end = file.window or (None, None)
+        directory = self.root / folder / partition
+        directory.mkdir(parents=True, exist_ok=True)
+        name = file.name + self.SUFFIXES[self.compression]
+        path = directory / name
+        self.write(file, path)
+        rows = self.rows(file)
+        self.update_manifest(
+            self.root / folder,
+            partition,
+            name,
+            {
+                "rows": rows,
+                "start": start and start.isoformat(),
+                "end": end and end.isoformat(),
+                "bytes": path.stat().st_size,
+                "compression": self.compression,
+                "written": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        logger.info(f"Wrote {rows} rows to {path}")
+
+    def create_folder(self, folder: str, parent: str):
+        (self.root / parent / folder).mkdir(parents=True, exist_ok=True)
 
-    def create_folder(self, folder: str, parent: str): ...
+    def create_folders(self, folders: list[str]):
+        """Do nothing: a scraper's folder is made along with its first partition, so scrapers that output nothing leave no empty folder."""
 
     def upload(self, file: File):
-        self.upload_file(file, "")
+        self.upload_file(file, file.origin_name)
@@ -1,7 +1,12 @@
+import io
 import mimetypes
-from io import BytesIO
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any, TYPE_CHECKING
+from typing import IO, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from siren.core.scraper import ScraperProto
@@ -10,21 +15,185 @@ if TYPE_CHECKING:
 __all__ = ("File",)
 
 
+SPOOL_SIZE = 16 * 1024 * 1024
+"""Outputs larger than this are spooled to a temporary file instead of being kept in memory."""
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[IO[bytes]]:
+    """
+    Open a temporary file next to `path` for writing, and move it over `path` once the block exits cleanly.
+
+    Readers see either the old file or the complete new one; the temporary file is removed if the block fails.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ViewReader(io.RawIOBase):
+    """A seekable, read-only stream over a :class:`memoryview` that never copies the whole view."""
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        chunk = self.view[self.pos : self.pos + len(buffer)]
+        n = len(chunk)
+        buffer[:n] = chunk
+        self.pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: len(self.view)}
+        self.pos = max(0, base[whence] + offset)
+        return self.pos
+
+    def tell(self) -> int:
+        return self.pos
+
+
 class File:
     """Represents a file that can be uploaded to a Cloud platform.
     This class normalizes the interface for files and in-memory buffers.
+
+    A file is backed by one of:
+
+    - bytes-like `data`, held as a :class:`memoryview` and read without copying.
+    - a `path` on disk, opened afresh for every reader.
+    - a seekable binary `stream`, such as the spooled temporary file made by :meth:`from_text`.
+
+    Use :meth:`buffer` or :meth:`chunks` to read the content; :attr:`data` makes a full copy and is kept for compatibility.
+
+    The name of the scraper that made the file and its `(start, end)` window are kept in :attr:`origin_name`
+    and :attr:`window`, so clouds can place a file without the scraper itself. Pickling a file (e.g. to return it
+    from a worker process) drops the scraper and turns a stream into bytes; path-backed files keep their path.
+
+    A stream-backed file holds its stream (and, past `SPOOL_SIZE`, a temporary file) open until :meth:`close`
+    is called, or until the ``with`` block using the file exits.
     """
 
-    def __init__(self, data: bytes, name: str, *, origin: "ScraperProto[Any]"):
-        self.data = data
-        self.name = name
-        self.mimetype = mimetypes.guess_type(name)[0] or "application/pdf"
+    def __init__(
+        self,
+        data: bytes | bytearray | memoryview | None = None,
+        name: str = "",
+        *,
+        origin: "ScraperProto[Any] | None",
+        path: Path | None = None,
+        stream: IO[bytes] | None = None,
+    ):
+        if (data is None) + (path is None) + (stream is None) != 2:
+            raise ValueError("File needs exactly one of data, path or stream")
+        self.view = memoryview(data).cast("B") if data is not None else None
+        self.path = path
+        self.stream = stream
+        self.name = name or (path.name if path else "")
+        self.mimetype = mimetypes.guess_type(self.name)[0] or "application/pdf"
         self.origin: "ScraperProto[Any] | None" = origin
+        self.origin_name = origin.__class__.__name__ if origin is not None else ""
+        start: datetime | None = getattr(origin, "start", None)
+        end: datetime | None = getattr(origin, "end", None)
+        self.window = (start, end) if start and end else None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__ | {"origin": None, "stream": None}
+        if self.path is None:
+            state["view"] = self.data
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        if state["view"] is not None:
+            state["view"] = memoryview(state["view"])
+        self.__dict__.update(state)
+
+    @property
+    def size(self) -> int:
+        if self.view is not None:
+            return self.view.nbytes
+        if self.path is not None:
+            return self.path.stat().st_size
+        assert self.stream is not None
+        position = self.stream.tell()
+        try:
+            return self.stream.seek(0, io.SEEK_END)
+        finally:
+            self.stream.seek(position)
 
-    def buffer(self):
-        return BytesIO(self.data)
+    @property
+    def data(self) -> bytes:
+        """The whole content as :class:`bytes`. Prefer :meth:`buffer` or :meth:`chunks` for large files."""
+        return b"".join(self.chunks())
+
+    def buffer(self) -> IO[bytes]:
+        """Return a seekable binary reader positioned at the start of the content."""
+        if self.view is not None:
+            return io.BufferedReader(ViewReader(self.view), CHUNK_SIZE)
+        if self.path is not None:
+            return self.path.open("rb")
+        assert self.stream is not None
+        self.stream.seek(0)
+        return self.stream
+
+    def chunks(self, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the content in chunks of at most `size` bytes."""
+        buffer = self.buffer()
+        try:
+            while chunk := buffer.read(size):
+                yield chunk
+        finally:
+            if buffer is not self.stream:
+                buffer.close()
+
+    def close(self):
+        """Close the stream backing the file, if any. Data- and path-backed files need no closing."""
+        if self.stream is not None:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def write_to(self, path: Path):
+        """Write the content to `path` atomically (see :func:`atomic_writer`)."""
+        with atomic_writer(path) as f:
+            for chunk in self.chunks():
+                f.write(chunk)
+
+    @classmethod
+    def from_path(cls, path: Path, *, origin: "ScraperProto[Any] | None"):
+        return cls(name=path.name, path=path, origin=origin)
 
     @classmethod
-    def from_path(cls, path: Path, *, origin: "ScraperProto[Any]"):
-        with path.open("wb") as f:
-            return File(f.read(), str(path), origin=origin)
+    def from_text(
+        cls,
+        text: io.StringIO,
+        name: str,
+        *,
+        origin: "ScraperProto[Any] | None",
+        encoding: str = "utf-8",
+    ):
+        """Encode `text` into a spooled temporary file, which moves to disk once it outgrows `SPOOL_SIZE`."""
+        stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        text.seek(0)
+        while chunk := text.read(CHUNK_SIZE):
+            stream.write(chunk.encode(encoding))
+        stream.seek(0)
+        return cls(name=name, stream=stream, origin=origin)
@@ -0,0 +1,83 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+__all__ = ("Paginator",)
+
+
+class Paginator[P]:
+    """
+    Fetches numbered pages in order with a bounded number of requests in flight.
+
+    Up to `lookahead` pages are requested ahead of the one being consumed, and pages are yielded in order.
+    Pagination ends at the first of:
+
+    - the page number returned by `last`, which is called on the first page. Nothing past it is requested,
+      and the first page is fetched on its own so the count is known before looking ahead.
+    - a page for which `stop` returns `True`. That page is still yielded; requests already sent for later pages are cancelled.
+    - a page that could not be fetched (`fetch` returned `None`), unless the page count is known,
+      in which case the page is skipped.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        paginator = Paginator(
+            search.get_page,
+            last=lambda page: math.ceil(page.total / page.size),
+            lookahead=4,
+        )
+        async for page in paginator:
+            ...
+
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[P | None]],
+        *,
+        first: int = 1,
+        lookahead: int = 4,
+        last: Callable[[P], int | None] | None = None,
+        stop: Callable[[P], bool] | None = None,
+    ):
+        self.fetch = fetch
+        self.first = first
+        self.lookahead = max(1, lookahead)
+        self.last = last
+        self.stop = stop
+        self.requests = 0
+
+    async def __aiter__(self) -> AsyncIterator[P]:
+        pending: deque[asyncio.Task[P | None]] = deque()
+        next_page = self.first
+        final: int | None = None
+        probing = self.last is not None
+        try:
+            while True:
+                while (
+                    len(pending) < self.lookahead
+                    and not (probing and next_page > self.first)
+                    and (final is None or next_page <= final)
+                ):
+                    pending.append(asyncio.create_task(self.fetch(next_page)))
+                    next_page += 1
+                    self.requests += 1
+                if not pending:
+                    return
+                page = await pending.popleft()
+                if probing:
+                    probing = False
+                    if page is not None and self.last:
+                        final = self.last(page)
+                if page is None:
+                    if final is None:
+                        return
+                    continue
+                yield page
+                if self.stop and self.stop(page):
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
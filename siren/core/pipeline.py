@@ -0,0 +1,146 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+__all__ = ("Pipeline",)
+
+
+_DONE: Any = object()
+
+
+class Stage:
+    def __init__(
+        self, fn: Callable[[Any], Awaitable[Any]], *, workers: int, maxsize: int
+    ):
+        self.fn = fn
+        self.workers = workers
+        self.maxsize = maxsize
+
+
+class Pipeline[T]:
+    """
+    A chain of async stages connected by bounded queues.
+
+    Every stage runs `workers` concurrent tasks that pull items from the queue in front of it,
+    and its output is pushed into the next queue, which holds at most `maxsize` items.
+    Producers block when the queue ahead of them is full, so the number of in-flight items is bounded
+    by the sum of the queue depths and worker counts regardless of how large the source is.
+
+    Stage functions may return `None` to drop an item.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        pipeline = (
+            Pipeline(urls)
+            .stage(download, workers=8)
+            .stage(parse, workers=2, maxsize=4)
+        )
+        async for item in pipeline:
+            ...
+
+    """
+
+    def __init__(self, source: Iterable[Any] | AsyncIterable[Any]):
+        self.source = source
+        self.stages: list[Stage] = []
+
+    def stage[R](
+        self,
+        fn: Callable[[T], Awaitable[R | None]],
+        *,
+        workers: int = 1,
+        maxsize: int | None = None,
+    ) -> "Pipeline[R]":
+        """
+        Append a stage to the pipeline.
+
+        Parameters
+        ----------
+
+        fn: :class:`Callable[[T], Awaitable[R | None]]`
+            The coroutine function to run on every item.
+
+        workers: :class:`int`
+            The number of items processed concurrently by this stage. Defaults to 1.
+
+        maxsize: :class:`int | None`
+            The depth of the queue feeding this stage. Defaults to `workers`.
+
+        """
+        workers = max(1, workers)
+        self.stages.append(Stage(fn, workers=workers, maxsize=maxsize or workers))
+        return self  # type: ignore
+
+    async def _feed(self, queue: asyncio.Queue[Any], workers: int):
+        if isinstance(self.source, AsyncIterable):
+            async for item in self.source:
+                await queue.put(item)
+        else:
+            for item in self.source:
+                await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def _work(
+        self, stage: Stage, inbox: asyncio.Queue[Any], outbox: asyncio.Queue[Any]
+    ):
+        while (item := await inbox.get()) is not _DONE:
+            result = await stage.fn(item)
+            if result is not None:
+                await outbox.put(result)
+
+    async def _run_stage(
+        self,
+        stage: Stage,
+        inbox: asyncio.Queue[Any],
+        outbox: asyncio.Queue[Any],
+        consumers: int,
+    ):
+        await asyncio.gather(
+            *(self._work(stage, inbox, outbox) for _ in range(stage.workers))
+        )
+        for _ in range(consumers):
+            await outbox.put(_DONE)
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(maxsize=stage.maxsize) for stage in self.stages
+        ]
+        queues.append(asyncio.Queue(maxsize=self.stages[-1].workers))
+        tasks = [asyncio.create_task(self._feed(queues[0], self.stages[0].workers))]
+        for i, stage in enumerate(self.stages):
+            consumers = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            tasks.append(
+                asyncio.create_task(
+                    self._run_stage(stage, queues[i], queues[i + 1], consumers)
+                )
+            )
+        runner = asyncio.gather(*tasks)
+        output = queues[-1]
+        try:
+            while True:
+                if runner.done():
+                    runner.result()  # re-raise the exception of a failed stage
+                    item = await output.get()
+                else:
+                    get = asyncio.ensure_future(output.get())
+                    await asyncio.wait(
+                        {get, runner}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not get.done():
+                        get.cancel()
+                        continue
+                    item = get.result()
+                if item is _DONE:
+                    break
+                yield item
+            await runner
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from logging import getLogger
+
+__all__ = ("Scheduler",)
+
+logger = getLogger(__name__)
+
+
+class Scheduler[T]:
+    """
+    Runs units of work with bounded concurrency, taking turns between groups.
+
+    Units are submitted under a group key (such as an edition ID) and started round-robin across groups,
+    so a group with thousands of units cannot starve the others. Units may submit more units while running.
+    Results stream out of :meth:`run` in completion order; units that raise are logged and skipped.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        scheduler = Scheduler[list[Article]](max_concurrency=16)
+        for edition in editions:
+            scheduler.submit(edition, lambda: search(edition))
+        async for articles in scheduler.run():
+            ...
+
+    """
+
+    def __init__(self, *, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.queues: dict[Hashable, deque[Callable[[], Awaitable[T]]]] = {}
+
+    def submit(self, group: Hashable, fn: Callable[[], Awaitable[T]]):
+        """Queue `fn` to be called under `group`."""
+        self.queues.setdefault(group, deque()).append(fn)
+
+    def _next(self) -> Callable[[], Awaitable[T]] | None:
+        for group in list(self.queues):
+            queue = self.queues.pop(group)
+            if not queue:
+                continue
+            fn = queue.popleft()
+            self.queues[group] = queue  # move the group to the back of the rotation
+            return fn
+        return None
+
+    async def run(self) -> AsyncIterator[T]:
+        """Run every submitted unit, yielding results as they complete."""
+
+        async def call(fn: Callable[[], Awaitable[T]]) -> T:
+            return await fn()
+
+        running: set[asyncio.Task[T]] = set()
+        try:
+            while True:
+                while len(running) < self.max_concurrency and (fn := self._next()):
+                    running.add(asyncio.create_task(call(fn)))
+                if not running:
+                    return
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if exc := task.exception():
+                        logger.error(f"Ignoring exception in scheduled task: {exc!r}")
+                        continue
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
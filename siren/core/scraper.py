@@ -5,7 +5,10 @@ from io import StringIO
 from .http import HTTP
 from .model import Model
 from .file import File
-from typing import Any, Protocol
+from typing import Any, ClassVar, Literal, Protocol
+
+
+type Workload = Literal["io", "cpu", "ocr"]
 
 
 def serialize_dt(dt: datetime) -> str:
@@ -66,6 +69,19 @@ class ScraperProto[T: Model](Protocol):
 
 class BaseScraper[T: Model](ABC, ScraperProto[T]):
 
+    WORKLOAD: ClassVar[Workload] = "io"
+    """
+    What bounds the scraper, which decides where `run_all --processes` runs it:
+    `"io"` scrapers share the main event loop, `"cpu"` scrapers (heavy HTML parsing) get a worker process each,
+    and `"ocr"` scrapers get a worker process from a pool of their own, sized by how many OCR threads each runs.
+    """
+
+    RUN_ALL: ClassVar[bool] = True
+    """
+    Whether `--scraper all` runs this scraper. Alternative engines for a source that another scraper
+    already covers set this to `False`, so the source is not scraped and uploaded twice.
+    """
+
     def __init__(
         self,
         *,
@@ -142,14 +158,18 @@ class BaseScraper[T: Model](ABC, ScraperProto[T]):
         return data
 
     async def to_file(self) -> File:
+        """
+        Return the scraped data as a CSV file named after the scraper and its window: the start date for a window
+        of up to a day, else the start and end dates. The start date is also the file's `Local` partition.
+        """
         file = await self.to_csv()
         fmt = "%Y-%m-%d"
         if (self.end - self.start) <= timedelta(days=1):
-            daterange = self.end.strftime(fmt)
+            daterange = self.start.strftime(fmt)
         else:
             daterange = f"{self.start.strftime(fmt)}_{self.end.strftime(fmt)}"
-        return File(
-            file.read().encode(),
+        return File.from_text(
+            file,
             f"{self.__class__.__name__}_{daterange}.csv",
             origin=self,
         )
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from .cloud import CloudProto
+from .file import File
+
+__all__ = ("Uploader", "UploadStats")
+
+logger = getLogger(__name__)
+
+
+class UploadStats:
+    """Counters collected by an :class:`Uploader`."""
+
+    def __init__(self):
+        self.files = 0
+        self.failed = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def add(self, size: int, seconds: float):
+        self.files += 1
+        self.bytes += size
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.files if self.files else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes uploaded per second of wall time since the uploader started."""
+        elapsed = time.perf_counter() - self.started
+        return self.bytes / elapsed if elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<UploadStats files={self.files} failed={self.failed} bytes={self.bytes} "
+            f"throughput={self.throughput / 1024:.1f}KiB/s "
+            f"latency_mean={self.mean_seconds:.2f}s latency_max={self.max_seconds:.2f}s>"
+        )
+
+
+class Uploader:
+    """
+    Uploads files to a :class:`CloudProto` on a dedicated thread pool, so uploads overlap with scraping
+    and never block the event loop.
+
+    Files handed to :meth:`submit` are uploaded in the background and closed afterwards. :meth:`flush` waits
+    for every pending upload, and leaving the ``async with`` block flushes and shuts the pool down.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        async with Uploader(cloud, workers=4) as uploader:
+            uploader.submit(await scraper.to_file())
+
+    """
+
+    def __init__(self, cloud: CloudProto, *, workers: int = 4):
+        self.cloud = cloud
+        self.pool = ThreadPoolExecutor(max(1, workers), "upload")
+        self.pending: set[asyncio.Task[None]] = set()
+        self.stats = UploadStats()
+
+    def _upload(self, file: File) -> float:
+        start = time.perf_counter()
+        self.cloud.upload(file)
+        return time.perf_counter() - start
+
+    async def upload(self, file: File):
+        """Upload `file`, then close it: the upload is the last reader of a scraper's file."""
+        loop = asyncio.get_running_loop()
+        with file:
+            size = file.size
+            try:
+                seconds = await loop.run_in_executor(self.pool, self._upload, file)
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(f"Ignoring exception while uploading {file.name}: {e!r}")
+                return
+        self.stats.add(size, seconds)
+        logger.info(f"Uploaded {file.name} in {seconds:.2f}s")
+
+    def submit(self, file: File) -> asyncio.Task[None]:
+        """Start uploading `file` in the background."""
+        task = asyncio.create_task(self.upload(file))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return task
+
+    async def flush(self):
+        """Wait for every pending upload."""
+        while self.pending:
+            await asyncio.gather(*self.pending)
+        logger.info(f"Uploads flushed: {self.stats}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        try:
+            await self.flush()
+        finally:
+            self.pool.shutdown(wait=True)
@@ -0,0 +1,157 @@
+"""
+Lazy registry of the scrapers under `siren/scrapers`.
+
+Scrapers are found by reading the `__all__` of every module under `siren/scrapers` with :mod:`ast`,
+without importing it, so selecting a scraper only imports that scraper's module (and its OCR, parsing
+and browser dependencies). The names found in each file are kept in a manifest in the cache directory,
+keyed by the file's modification time and size, so later runs do not need to parse the sources again.
+"""
+
+from __future__ import annotations
+import ast
+import hashlib
+import importlib
+import json
+import os
+from collections.abc import Iterator, Mapping
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from siren.core.scraper import ScraperProto
+
+__all__ = ("ScraperRegistry",)
+
+logger = getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def exported_names(source: str) -> list[str] | None:
+    """
+    Return the names listed in the top-level `__all__` of a module's source.
+
+    Returns `None` if `__all__` is not a literal, in which case the module has to be imported to read it.
+    """
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "__all__" for t in targets):
+            continue
+        try:
+            names = ast.literal_eval(node.value)  # type: ignore
+        except ValueError:
+            return None
+        return [str(name) for name in names]
+    return []
+
+
+class ScraperRegistry(Mapping[str, "type[ScraperProto[Any]]"]):
+    """
+    A read-only mapping of scraper names (e.g. `epaper.toi.TOIScraper`) to scraper classes.
+
+    The keys are available without importing any scraper. A scraper's module is imported the first time
+    the scraper is looked up.
+
+    Parameters
+    ----------
+
+    root: :class:`pathlib.Path`
+        The directory holding the scraper modules. Defaults to `siren/scrapers` next to this file,
+        whatever the working directory is.
+
+    package: :class:`str`
+        The import name of `root`.
+
+    """
+
+    def __init__(self, root: Path | None = None, package: str = "siren.scrapers"):
+        self.root = (root or Path(__file__).parent / "scrapers").resolve()
+        self.package = package
+        self._modules: dict[str, str] | None = None
+        self._loaded: dict[str, type[ScraperProto[Any]]] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        # same location as `siren.core.cache_dir("registry")`, without importing `siren.core`
+        folder = Path(os.getenv("SIREN_CACHE_DIR", ".siren"), "registry")
+        folder.mkdir(parents=True, exist_ok=True)
+        key = hashlib.sha1(str(self.root).encode()).hexdigest()[:12]
+        return folder / f"scrapers-{key}.json"
+
+    def load_manifest(self) -> dict[str, Any]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("files", {})
+
+    def save_manifest(self, files: dict[str, Any]):
+        path = self.manifest_path
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "files": files}))
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not save the scraper manifest: {e}")
+
+    def module_name(self, relpath: str) -> str:
+        parts = relpath[:-3].split("/")
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join([self.package, *parts])
+
+    def scan(self) -> dict[str, str]:
+        """Return the module of every scraper, reading only the files that changed since the manifest was saved."""
+        cached = self.load_manifest()
+        files: dict[str, Any] = {}
+        modules: dict[str, str] = {}
+        for path in sorted(self.root.rglob("*.py")):
+            relpath = path.relative_to(self.root).as_posix()
+            stat = path.stat()
+            entry = cached.get(relpath)
+            if not (
+                entry
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size
+            ):
+                names = exported_names(path.read_text(encoding="utf-8"))
+                if names is None:
+                    module = importlib.import_module(self.module_name(relpath))
+                    names = list(getattr(module, "__all__", []))
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "names": names}
+            files[relpath] = entry
+            prefix = relpath[:-3].replace("/", ".")
+            for name in entry["names"]:
+                modules[f"{prefix}.{name}"] = self.module_name(relpath)
+        if files != cached:
+            self.save_manifest(files)
+        return modules
+
+    @property
+    def modules(self) -> dict[str, str]:
+        if self._modules is None:
+            self._modules = self.scan()
+        return self._modules
+
+    def __getitem__(self, name: str) -> type[ScraperProto[Any]]:
+        if (scraper := self._loaded.get(name)) is None:
+            module = importlib.import_module(self.modules[name])
+            scraper = self._loaded[name] = getattr(module, name.rsplit(".", 1)[-1])
+        return scraper
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.modules
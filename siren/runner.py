@@ -0,0 +1,192 @@
+"""
+Runs scrapers, in this process or in worker processes.
+
+With `--scraper all --processes N`, each scraper is placed by its :attr:`~siren.core.BaseScraper.WORKLOAD`:
+I/O-bound scrapers share the main event loop, while CPU-bound and OCR scrapers run in worker processes, each
+on its own event loop. The files they produce are sent back to the main process, which uploads them.
+Worker processes can only run importable functions, so they live here rather than in `siren.__main__`,
+which parses the command line when it is imported.
+"""
+
+from __future__ import annotations
+import asyncio
+import copy
+import multiprocessing
+import time
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+from httpx import AsyncClient, Timeout
+from pydantic import BaseModel
+from siren.core import HTTP, File, ScraperProto
+from siren.core.scraper import Workload
+
+__all__ = ("RunOptions", "WorkerPool", "run", "run_scraper")
+
+logger = getLogger(__name__)
+
+try:
+    import uvloop
+
+    run = uvloop.run
+except ModuleNotFoundError:
+    run = asyncio.run
+
+
+class RunOptions(BaseModel):
+    """
+    The arguments every scraper of a run is constructed with. Sent to worker processes, so it must stay picklable.
+    """
+
+    start: datetime
+    end: datetime
+    keywords: list[str]
+    timeout: int | None = None
+    max_concurrency: int | None = None
+
+
+async def run_scraper(
+    Scraper: type[ScraperProto[Any]], options: RunOptions
+) -> File | None:
+    """Run a scraper with its own HTTP client and return its file, or `None` if it failed."""
+    start = time.perf_counter()
+    file = None
+    async with AsyncClient(timeout=Timeout(options.timeout)) as client:
+        try:
+            scraper = Scraper(
+                start=options.start,
+                end=options.end,
+                keywords=options.keywords,
+                http=HTTP(client, max_concurrency=options.max_concurrency),
+            )
+            logger.info(f"Scraping {scraper} with keywords: {options.keywords}")
+            file = await scraper.to_file()
+        except Exception as e:
+            logger.error("\n".join(traceback.format_exception(e)))
+    end = time.perf_counter()
+    logger.info(f"{Scraper.__name__} completed in {end - start}s.")
+    return file
+
+
+def scrape_in_process(name: str, options: RunOptions) -> File | None:
+    """Run the scraper registered as `name` on a new event loop. This is what worker processes run."""
+    from siren import SCRAPERS
+
+    file = run(run_scraper(SCRAPERS[name], options))
+    if file is None:
+        return None
+    with file:
+        # a copy goes through `File.__getstate__`, so it holds the content rather than the stream closed here
+        return copy.copy(file)
+
+
+class WorkerPool:
+    """
+    Process pools for the scrapers that should not share the main event loop.
+
+    The `processes` workers are split between `"cpu"` and `"ocr"` scrapers (see :meth:`split`), in separate pools:
+    a worker that dies (e.g. killed for running out of memory) breaks its whole pool, failing every scraper
+    running in it, so an OCR crash does not take the CPU-bound scrapers down with it. A broken pool is not
+    replaced, as that would fork the main process after its threads have started, so the scrapers queued
+    behind the crash fail too. With a single process, both workloads share one pool.
+    `"io"` scrapers are not placed (see :meth:`places`).
+
+    Workers are forked where the platform allows it, so they do not import `siren.__main__` again.
+    Forking is only safe before the main process starts other threads, so the pools fork their workers
+    as soon as they are created; create them before the uploads start.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        with WorkerPool(os.cpu_count(), SCRAPERS.values()) as pool:
+            if pool.places(Scraper):
+                file = await pool.scrape(name, Scraper, options)
+
+    """
+
+    def __init__(self, processes: int, Scrapers: Iterable[type[ScraperProto[Any]]] = ()):
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        ocr_threads = max(
+            (getattr(S, "OCR_WORKERS", 1) for S in Scrapers if self.workload(S) == "ocr"), default=1
+        )
+        self.sizes = self.split(processes, ocr_threads)
+        self.executors: dict[Workload, ProcessPoolExecutor] = {}
+        self.limits: dict[Workload, asyncio.Semaphore] = {}
+        self.broken: set[Workload] = set()
+        if processes == 1:
+            executor, limit = self.executor(1), asyncio.Semaphore(1)
+            self.executors = dict.fromkeys(self.sizes, executor)
+            self.limits = dict.fromkeys(self.sizes, limit)
+        else:
+            for workload, n in self.sizes.items():
+                self.executors[workload] = self.executor(n)
+                self.limits[workload] = asyncio.Semaphore(n)
+
+    @staticmethod
+    def split(processes: int, ocr_threads: int = 1) -> dict[Workload, int]:
+        """
+        How many of `processes` workers run each workload: at least one each, or one shared by both.
+
+        An OCR scraper keeps about `ocr_threads` cores busy (its
+        :attr:`~siren.scrapers.epaper.readwhere.ocr.BaseReadwhereScraperOCR.OCR_WORKERS` Tesseract threads) and a
+        CPU-bound scraper one, so the OCR pool gets the share of the workers that gives both workloads as many cores.
+        """
+        if processes <= 1:
+            return {"cpu": 1, "ocr": 1}
+        ocr = min(processes - 1, max(1, processes // (1 + ocr_threads)))
+        return {"cpu": processes - ocr, "ocr": ocr}
+
+    def executor(self, processes: int) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(processes, self.context)
+        executor.submit(int)  # forks every worker now
+        return executor
+
+    @staticmethod
+    def workload(Scraper: type[ScraperProto[Any]]) -> Workload:
+        return getattr(Scraper, "WORKLOAD", "io")
+
+    def places(self, Scraper: type[ScraperProto[Any]]) -> bool:
+        """Whether `Scraper` runs in a worker process rather than on the main event loop."""
+        return self.workload(Scraper) in self.limits
+
+    async def scrape(
+        self, name: str, Scraper: type[ScraperProto[Any]], options: RunOptions
+    ) -> File | None:
+        """
+        Run the scraper registered as `name` in a worker process and return its file.
+
+        Raises :class:`~concurrent.futures.process.BrokenProcessPool` if a worker of its pool died while it ran.
+        """
+        workload = self.workload(Scraper)
+        async with self.limits[workload]:
+            logger.info(f"Running {Scraper.__name__} in a worker process ({workload})")
+            executor = self.executors[workload]
+            try:
+                future = executor.submit(scrape_in_process, name, options)
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                # every scraper running in the pool fails with it, and every one submitted later fails right away
+                if workload not in self.broken:
+                    shared = [w for w, e in self.executors.items() if e is executor]
+                    self.broken.update(shared)
+                    logger.warning(
+                        f"A worker process of the {' and '.join(shared)} pool died, its remaining scrapers will fail"
+                    )
+                raise
+
+    def close(self):
+        for executor in set(self.executors.values()):
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
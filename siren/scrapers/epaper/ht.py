@@ -1,10 +1,11 @@
 from typing import Any, Annotated, ClassVar
 from yarl import URL
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
 import httpx
 import asyncio
-from siren.core import BaseScraper, Model
+from pathlib import Path
+from siren.core import BaseScraper, Model, cache_dir
 from logging import getLogger
 from pydantic import Field, BeforeValidator, ValidationError
 
@@ -88,6 +89,7 @@ class HTArticle(Model):
         "edition_date",
         "edition_name",
         "thumbnail",
+        "matched_keywords",
     )
 
     partial: HTPartialArticle
@@ -101,6 +103,21 @@ class HTArticle(Model):
     page_number_: str = Field(alias="PageNumber")
     link_pictures: list[LinkPicture] = Field(alias="LinkPicture")
     story_content: list[Story] = Field(alias="StoryContent")
+    keywords: list[str] = []
+    """The keywords whose searches found this article."""
+    edition_ids: list[int] = []
+    """The edition IDs whose searches found this article."""
+
+    def add_match(self, keyword: str, edition_id: int):
+        """Record that searching `keyword` in `edition_id` found this article."""
+        if keyword not in self.keywords:
+            self.keywords.append(keyword)
+        if edition_id not in self.edition_ids:
+            self.edition_ids.append(edition_id)
+
+    @property
+    def matched_keywords(self) -> str:
+        return ", ".join(self.keywords)
 
     @classmethod
     async def from_partial(
@@ -157,10 +174,173 @@ class HTArticle(Model):
         return hash(self.headline)
 
 
+class EditionCoverage(Model):
+    """
+    A range of dates known for an edition: the earliest and latest issue dates seen for a live edition,
+    or the range a dead edition was probed over without results.
+    """
+
+    first: datetime
+    last: datetime
+
+    def update(self, date: datetime):
+        self.first = min(self.first, date)
+        self.last = max(self.last, date)
+
+
+class EditionIndex(Model):
+    """
+    Which HT edition IDs are live, persisted between runs.
+
+    Attributes
+    ----------
+
+    checked: :class:`datetime`
+        When the edition IDs were last probed.
+
+    live: :class:`dict[int, EditionCoverage]`
+        The edition IDs that returned results, with the issue dates seen for them.
+
+    dead: :class:`dict[int, EditionCoverage]`
+        The edition IDs that returned nothing when probed, with the range they were probed over.
+        They are only known to be dead within that range.
+
+    """
+
+    checked: datetime
+    live: dict[int, EditionCoverage] = {}
+    dead: dict[int, EditionCoverage] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> "EditionIndex | None":
+        try:
+            return cls.model_validate_json(path.read_text())
+        except (OSError, ValidationError):
+            return None
+
+    def save(self, path: Path):
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(self.model_dump_json(indent=2))
+        tmp.replace(path)
+
+    def observe(self, partial: HTPartialArticle):
+        """Record that `partial`'s edition had an issue on its date."""
+        if coverage := self.live.get(partial.edition_id):
+            coverage.update(partial.edition_date)
+        else:
+            self.live[partial.edition_id] = EditionCoverage(
+                first=partial.edition_date, last=partial.edition_date
+            )
+        self.dead.pop(partial.edition_id, None)
+
+    def dead_since(self, start: datetime) -> set[int]:
+        """
+        Return the edition IDs known to have no issues from `start` onwards.
+
+        An edition probed from `start` or earlier had none up to the probe; editions launched since then
+        are found when the IDs are probed again after `EDITION_TTL`.
+        """
+        return {edition_id for edition_id, probed in self.dead.items() if probed.first <= start}
+
+
 class HTScraper(BaseScraper[HTArticle]):
     BASE_URL = URL("https://epaper.hindustantimes.com/Home/Search")
     EDITIONS = list(range(60))
 
+    EDITION_PROBE: ClassVar[tuple[str, ...]] = ("India", "Delhi")
+    """Common search terms used to tell live edition IDs from dead ones."""
+
+    EDITION_PROBE_WINDOW: ClassVar[timedelta] = timedelta(days=30)
+    """How far back from now the probe searches look at least. They start at the scraper's start if that is earlier."""
+
+    EDITION_TTL: ClassVar[timedelta] = timedelta(days=30)
+    """How long a discovered set of live editions is trusted before the IDs are probed again."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.fetches: dict[str, asyncio.Task[HTArticle | None]] = {}
+
+    def fetch_article(
+        self, partial: HTPartialArticle, *, client: httpx.AsyncClient
+    ) -> asyncio.Task[HTArticle | None]:
+        """Return the task fetching `partial`'s article, starting it only if this article has not been requested before."""
+        if (task := self.fetches.get(partial.article_id)) is None:
+            task = asyncio.create_task(HTArticle.from_partial(partial, client=client))
+            self.fetches[partial.article_id] = task
+        return task
+
+    @property
+    def editions_path(self) -> Path:
+        return cache_dir("ht") / "editions.json"
+
+    @property
+    def window(self) -> tuple[datetime, datetime]:
+        """The scraper's window as naive datetimes, comparable with the dates in the :class:`EditionIndex`."""
+        return self.start.replace(tzinfo=None), self.end.replace(tzinfo=None)
+
+    async def discover_editions(self, *, client: httpx.AsyncClient) -> EditionIndex:
+        """Probe every ID in `EDITIONS` with `EDITION_PROBE` over the scraper's window and the recent past, and return which ones are live."""
+        now = datetime.now()
+        since = min(self.window[0], now - self.EDITION_PROBE_WINDOW)
+        index = EditionIndex(checked=now)
+
+        async def probe(edition_id: int) -> tuple[int, list[HTPartialArticle] | None]:
+            found: list[HTPartialArticle] = []
+            for term in self.EDITION_PROBE:
+                try:
+                    found += await self._scrape_search(
+                        search_text=term,
+                        edition_id=edition_id,
+                        from_date=since,
+                        to_date=now,
+                        client=client,
+                    )
+                except Exception as e:
+                    logger.error(f"Ignoring exception while probing HT edition {edition_id}: {e}")
+                    return edition_id, None
+                if found:
+                    break
+            return edition_id, found
+
+        for edition_id, found in await asyncio.gather(*(probe(i) for i in self.EDITIONS)):
+            if found is None:  # unknown, keep searching it
+                index.live.setdefault(edition_id, EditionCoverage(first=now, last=now))
+            elif not found:
+                index.dead[edition_id] = EditionCoverage(first=since, last=now)
+            for partial in found or []:
+                index.observe(partial)
+        return index
+
+    async def edition_index(self, *, client: httpx.AsyncClient) -> EditionIndex:
+        """
+        Return the persisted :class:`EditionIndex`, probing the edition IDs again if it is missing, older than `EDITION_TTL`,
+        or its probes started after the scraper's window (e.g. for a historical run).
+        """
+        index = EditionIndex.load(self.editions_path)
+        start, _ = self.window
+        if (
+            index is None
+            or datetime.now() - index.checked > self.EDITION_TTL
+            or not set(self.EDITIONS) <= set(index.live) | set(index.dead)
+            or any(probed.first > start for probed in index.dead.values())
+        ):
+            index = await self.discover_editions(client=client)
+            if index.live:
+                index.save(self.editions_path)
+        return index
+
+    def live_editions(self, index: EditionIndex) -> list[int]:
+        """Return the IDs in `EDITIONS` that are not known to be dead within the scraper's window."""
+        dead = index.dead_since(self.window[0])
+        if not index.live:  # discovery failed entirely, don't trust it
+            return list(self.EDITIONS)
+        editions = [i for i in self.EDITIONS if i not in dead]
+        logger.info(
+            f"Skipping {len(self.EDITIONS) - len(editions)}/{len(self.EDITIONS)} dead HT edition IDs"
+            f" ({(len(self.EDITIONS) - len(editions)) / max(1, len(self.EDITIONS)):.0%})"
+        )
+        return editions
+
     def build_url(
         self,
         *,
@@ -192,8 +372,8 @@ class HTScraper(BaseScraper[HTArticle]):
         url = self.build_url(
             search_text=search_text,
             edition_id=edition_id,
-            from_date=self.start,
-            to_date=self.end,
+            from_date=from_date,
+            to_date=to_date,
         )
         resp = await client.get(str(url))
         soup = BeautifulSoup(resp.text, "html.parser")
@@ -229,9 +409,11 @@ class HTScraper(BaseScraper[HTArticle]):
         to_date: datetime | None = None,
         client: httpx.AsyncClient,
     ):
-        """Scrape a search page and return a list of :class:`HTArticle` from the partials."""
-        tasks: list[asyncio.Task[HTArticle | None]] = []
-        done: set[str] = set()
+        """
+        Scrape a search page and return a list of :class:`HTArticle` from the partials.
+        Articles already fetched by another search are shared rather than downloaded again.
+        """
+        tasks: dict[str, asyncio.Task[HTArticle | None]] = {}
         for partial in await self._scrape_search(
             search_text=search_text,
             edition_id=edition_id,
@@ -239,18 +421,19 @@ class HTScraper(BaseScraper[HTArticle]):
             to_date=to_date,
             client=client,
         ):
-            if (aid := partial.article_id) not in done:
-                task = asyncio.create_task(
-                    HTArticle.from_partial(partial, client=client)
-                )
-                tasks.append(task)
-                done.add(aid)
-        return [a for a in await asyncio.gather(*tasks) if a]
+            if partial.article_id not in tasks:
+                tasks[partial.article_id] = self.fetch_article(partial, client=client)
+        articles = [a for a in await asyncio.gather(*tasks.values()) if a]
+        for article in articles:
+            article.add_match(search_text, edition_id)
+        return articles
 
     async def scrape(self) -> list[HTArticle]:
         tasks: list[asyncio.Task[list[HTArticle]]] = []
+        self.fetches.clear()
         async with httpx.AsyncClient(timeout=None) as client:
-            for ed_id in self.EDITIONS:
+            index = await self.edition_index(client=client)
+            for ed_id in self.live_editions(index):
                 for keyword in self.keywords:
                     task = asyncio.create_task(
                         self._scrape(
@@ -259,10 +442,20 @@ class HTScraper(BaseScraper[HTArticle]):
                     )
                     tasks.append(task)
             done: set[str] = set()
+            seen: set[str] = set()
             result: list[HTArticle] = []
             for chunk in await asyncio.gather(*tasks):
                 for article in chunk:
+                    if article.partial.article_id in seen:
+                        continue
+                    seen.add(article.partial.article_id)
+                    index.observe(article.partial)
                     if article.headline not in done:
                         done.add(article.headline)
                         result.append(article)
+            if index.live:
+                index.save(self.editions_path)
+            logger.info(
+                f"Fetched {len(self.fetches)} distinct HT articles for {len(tasks)} searches"
+            )
             return result
@@ -0,0 +1,136 @@
+"""
+OCR benchmark for the Readwhere scrapers.
+
+Runs every (level, strategy, preprocessing) combination over the first pages of one issue
+and reports the number of OCR calls, the seconds spent per page (OCR and preprocessing)
+and the keyword recall relative to the union of keywords found by all combinations.
+
+Usage: python -m siren.scrapers.epaper.readwhere.bench --date 2024-06-10 --keywords suicide "found dead"
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import get_args
+from httpx import AsyncClient, Timeout
+from siren.core import HTTP
+from .ocr import OCROptions, OCRStats, PageMeta, PartialArticleOCR, Strategy
+from .preprocess import Preprocess, TextFilter
+from .tie import TIEScraperOCR
+
+
+PRESETS = {
+    "none": Preprocess(),
+    "binarize": Preprocess(binarize=True),
+    "deskew": Preprocess(binarize=True, deskew=True),
+    "half": Preprocess(scale=0.5, binarize=True),
+}
+
+
+class Run:
+    def __init__(self, level: str, strategy: Strategy, preset: str):
+        self.level = level
+        self.strategy = strategy
+        self.preset = preset
+        self.stats = OCRStats()
+        self.found: set[str] = set()
+        self.wall = 0.0
+
+
+async def benchmark(
+    partial: PartialArticleOCR,
+    *,
+    keywords: list[str],
+    http: HTTP,
+    pages: int = 2,
+    levels: list[str] | None = None,
+    presets: list[str] = ["none"],
+    text_filter: TextFilter | None = None,
+) -> list[Run]:
+    meta = await partial.get_pagemeta(client=http)
+    meta = PageMeta(pages=dict(list(meta.pages.items())[:pages]))
+    if not meta.pages:
+        return []
+    levels = levels or next(iter(meta.pages.values())).levels.ranked()
+    runs: list[Run] = []
+    for level in levels:
+        for strategy in get_args(Strategy.__value__):
+            for preset in presets:
+                run = Run(level, strategy, preset)
+                start = time.perf_counter()
+                result = await partial.search(
+                    http,
+                    keywords,
+                    options=OCROptions(
+                        level=level,
+                        strategy=strategy,
+                        preprocess=PRESETS[preset],
+                        text_filter=text_filter,
+                    ),
+                    stats=run.stats,
+                    meta=meta,
+                )
+                run.wall = time.perf_counter() - start
+                for page in result.pages:
+                    run.found |= page.found(keywords)
+                runs.append(run)
+    return runs
+
+
+def report(runs: list[Run]):
+    relevant = set[str]().union(*(run.found for run in runs))
+    print(
+        f"{'level':<14}{'strategy':<10}{'preprocess':<12}{'calls':>7}"
+        f"{'s/page':>10}{'prep s':>10}{'skipped':>9}{'recall':>9}"
+    )
+    for run in runs:
+        recall = len(run.found) / len(relevant) if relevant else 1.0
+        print(
+            f"{run.level:<14}{run.strategy:<10}{run.preset:<12}{run.stats.calls:>7}"
+            f"{run.stats.seconds_per_page:>10.2f}{run.stats.preprocess_seconds:>10.2f}"
+            f"{run.stats.skip_rate:>9.0%}{recall:>9.0%}"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", required=True)
+    parser.add_argument("--keywords", nargs="+", required=True)
+    parser.add_argument("--edition", default=None)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--levels", nargs="+", default=None)
+    parser.add_argument("--text-filter", action="store_true")
+    parser.add_argument(
+        "--preprocess", nargs="+", choices=list(PRESETS), default=["none", "binarize"]
+    )
+    args = parser.parse_args()
+    start = datetime.strptime(args.date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    async with AsyncClient(timeout=Timeout(None)) as client:
+        http = HTTP(client)
+        scraper = TIEScraperOCR(
+            start=start, end=start + timedelta(days=1), keywords=args.keywords, http=http
+        )
+        edition_id = args.edition or next(iter(scraper.EDITIONS))
+        partials = await scraper.get_partial_articles_ocr(
+            edition_id, scraper.EDITIONS[edition_id]
+        )
+        if not partials:
+            print(f"No issues found for edition {edition_id} on {args.date}")
+            return
+        report(
+            await benchmark(
+                partials[0],
+                keywords=args.keywords,
+                http=http,
+                pages=args.pages,
+                levels=args.levels,
+                presets=args.preprocess,
+                text_filter=TextFilter(audit=0) if args.text_filter else None,
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
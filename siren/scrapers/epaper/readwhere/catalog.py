@@ -0,0 +1,108 @@
+"""
+On-disk catalog of Readwhere issues.
+
+Past issues never change, so the issue IDs returned by the `publishdates` endpoint are kept per site
+along with the time ranges that have already been listed. Later runs only ask the server for the parts
+of their range that are not covered yet.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    edition_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (edition_id, id)
+);
+CREATE INDEX IF NOT EXISTS issues_published ON issues (edition_id, published);
+CREATE TABLE IF NOT EXISTS coverage (
+    edition_id TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+"""
+
+
+class IssueCatalog:
+    """
+    SQLite-backed catalog of the issues of a Readwhere site.
+
+    All times are POSIX timestamps in seconds, matching the `publishdates` endpoint, and ranges are inclusive.
+
+    Parameters
+    ----------
+
+    path: :class:`pathlib.Path`
+        The database file. It is created if it does not exist.
+
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def coverage(self, edition_id: str) -> list[tuple[int, int]]:
+        """Return the sorted, non-overlapping ranges already listed for `edition_id`."""
+        return self.db.execute(
+            "SELECT start, end FROM coverage WHERE edition_id = ? ORDER BY start",
+            (edition_id,),
+        ).fetchall()
+
+    def gaps(self, edition_id: str, start: int, end: int) -> list[tuple[int, int]]:
+        """Return the parts of `start`..`end` that are not covered yet."""
+        gaps: list[tuple[int, int]] = []
+        cursor = start
+        for lo, hi in self.coverage(edition_id):
+            if hi < cursor:
+                continue
+            if lo > end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo - 1))
+            cursor = hi + 1
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def cover(self, edition_id: str, start: int, end: int):
+        """Mark `start`..`end` as listed, merging it with adjacent ranges."""
+        ranges = sorted([*self.coverage(edition_id), (start, end)])
+        merged: list[tuple[int, int]] = []
+        for lo, hi in ranges:
+            if merged and lo <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        self.db.execute("DELETE FROM coverage WHERE edition_id = ?", (edition_id,))
+        self.db.executemany(
+            "INSERT INTO coverage VALUES (?, ?, ?)",
+            [(edition_id, lo, hi) for lo, hi in merged],
+        )
+
+    def add(self, edition_id: str, issues: list[tuple[str, int, dict[str, Any]]]):
+        """Store `(id, published, data)` issues, where `data` is the raw JSON of the issue."""
+        self.db.executemany(
+            "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?)",
+            [(edition_id, id, published, json.dumps(data)) for id, published, data in issues],
+        )
+
+    def issues(self, edition_id: str, start: int, end: int) -> list[dict[str, Any]]:
+        """Return the raw JSON of every known issue of `edition_id` published within `start`..`end`."""
+        rows = self.db.execute(
+            "SELECT data FROM issues WHERE edition_id = ? AND published BETWEEN ? AND ?"
+            " ORDER BY published",
+            (edition_id, start, end),
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def commit(self):
+        self.db.commit()
@@ -1,11 +1,16 @@
 from __future__ import annotations
 import asyncio
+import time
 import pytesseract  # type: ignore
-from datetime import datetime
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from typing import Any, ClassVar
 from pydantic import ConfigDict
 from yarl import URL
 from logging import getLogger
-from siren.core import Model, ClientProto, BaseScraper
+from siren.core import Model, ClientProto, BaseScraper, Scheduler, cache_dir
+from .catalog import IssueCatalog
 
 
 logger = getLogger(__name__)
@@ -132,8 +137,30 @@ class BaseReadwhereScraper(BaseScraper[Article]):
     BASE_URL: URL
     EDITIONS: dict[str, str]
 
+    SEARCH_CONCURRENCY: ClassVar[int] = 32
+    """The maximum number of (edition, issue, keyword) searches in flight at once."""
+
+    ISSUE_CATALOG: ClassVar[bool] = True
+    """Whether to keep listed issues in the site's :class:`IssueCatalog` and only list ranges not seen before."""
+
+    CATALOG_SETTLE: ClassVar[timedelta] = timedelta(days=2)
+    """Ranges newer than this are listed again on every run, since late issues may still be published in them."""
+
     model = Article
 
+    @cached_property
+    def catalog(self) -> IssueCatalog:
+        """The :class:`IssueCatalog` of this scraper's site."""
+        return IssueCatalog(cache_dir("catalog") / f"{self.BASE_URL.host}.sqlite3")
+
+    async def list_issues(
+        self, edition_id: int | str, start: int, end: int
+    ) -> list[dict[str, Any]]:
+        """Fetch the raw JSON of the issues of an edition published between the `start` and `end` timestamps."""
+        url = self.BASE_URL / f"viewer/publishdates/{edition_id}/{start}/{end}/json"
+        resp = await self.http.get(str(url))
+        return resp.json()
+
     async def get_partial_articles(
         self,
         edition_id: int | str,
@@ -143,6 +170,7 @@ class BaseReadwhereScraper(BaseScraper[Article]):
     ) -> list[PartialArticle]:
         """
         Retrieves :class:`PartialArticle`s for the given edition ID. If `start` or `end` are passed here, they are prioritised over the scraper's start and end.
+        Issues already in the site's :class:`IssueCatalog` are read from disk; only uncovered ranges are listed by the server.
 
         Parameters
         ----------
@@ -166,41 +194,103 @@ class BaseReadwhereScraper(BaseScraper[Article]):
         """
         start = start or self.start
         end = end or self.end
-        url = (
-            self.BASE_URL
-            / f"viewer/publishdates/{edition_id}/{int(start.timestamp())}/{int(end.timestamp())}/json"
-        )
-        resp = await self.http.get(str(url))
-        return [
-            PartialArticle(
-                **i,
+        lo, hi = int(start.timestamp()), int(end.timestamp())
+
+        def partial(data: dict[str, Any]) -> PartialArticle:
+            return PartialArticle(
+                **data,
                 edition_id=edition_id,
                 edition_name=edition_name,
                 base_url=self.BASE_URL,
             )
-            for i in resp.json()
-        ]
+
+        if not self.ISSUE_CATALOG:
+            return [partial(i) for i in await self.list_issues(edition_id, lo, hi)]
+
+        catalog = self.catalog
+        edition = str(edition_id)
+        settled = int((datetime.now(timezone.utc) - self.CATALOG_SETTLE).timestamp())
+        gaps = catalog.gaps(edition, lo, hi)
+        for gap_start, gap_end in gaps:
+            issues = await self.list_issues(edition_id, gap_start, gap_end)
+            rows: list[tuple[str, int, dict[str, Any]]] = []
+            for issue in issues:
+                p = partial(issue)
+                rows.append((str(p.id), int(p.published.timestamp()), issue))
+            catalog.add(edition, rows)
+            if (covered := min(gap_end, settled)) >= gap_start:
+                catalog.cover(edition, gap_start, covered)
+            # commit before the next request: other scrapers of this site write to the same database
+            catalog.commit()
+        partials = [partial(i) for i in catalog.issues(edition, lo, hi)]
+        logger.info(
+            f"Listed {len(partials)} issues of {edition_name} ({len(gaps)} ranges fetched from the server)"
+        )
+        return partials
+
+    async def search_unit(
+        self, partial: PartialArticle, keyword: str
+    ) -> list[Article]:
+        """Search a single issue for a single keyword."""
+        sr = await partial.search_one(keyword, client=self.http)
+        return sr.data if sr and sr.status else []
+
+    async def schedule_edition(
+        self,
+        scheduler: Scheduler[list[Article]],
+        edition_id: int | str,
+        edition_name: str,
+    ) -> list[Article]:
+        """List the issues of an edition and submit an (issue, keyword) search for each to `scheduler`."""
+        partials = await self.get_partial_articles(edition_id, edition_name)
+        logger.info(f"Scheduling {len(partials)} issues of {edition_name}")
+        for partial in partials:
+            for keyword in self.keywords:
+                scheduler.submit(
+                    edition_id,
+                    lambda partial=partial, keyword=keyword: self.search_unit(
+                        partial, keyword
+                    ),
+                )
+        return []
+
+    async def search_stream(
+        self, editions: dict[str, str] | None = None
+    ) -> AsyncIterator[Article]:
+        """
+        Search every issue of the given editions (defaults to `EDITIONS`) for every keyword,
+        yielding :class:`Article`s as soon as each search completes.
+
+        All (edition, issue, keyword) searches share one :class:`Scheduler`, which takes turns between
+        editions so large editions do not delay small ones.
+        """
+        editions = self.EDITIONS if editions is None else editions
+        scheduler = Scheduler[list[Article]](max_concurrency=self.SEARCH_CONCURRENCY)
+        for edition_id, edition_name in editions.items():
+            scheduler.submit(
+                edition_id,
+                lambda id=edition_id, name=edition_name: self.schedule_edition(
+                    scheduler, id, name
+                ),
+            )
+        start = time.perf_counter()
+        count = 0
+        async for articles in scheduler.run():
+            count += len(articles)
+            for article in articles:
+                yield article
+        logger.info(
+            f"Found {count} articles in {len(editions)} editions in {time.perf_counter() - start:.2f}s"
+        )
 
     async def search_edition(
         self, edition_id: int | str, edition_name: str
     ) -> list[Article]:
         """Search an edition and return a list of :class:`Article`"""
-        partials = await self.get_partial_articles(edition_id, edition_name)
-        ret: list[Article] = []
-        for partial in partials:
-            data = await partial.search_many(self.keywords, client=self.http)
-            for sr in data:
-                ret.extend(sr.data)
-        return ret
+        return [a async for a in self.search_stream({str(edition_id): edition_name})]
 
     async def scrape(self) -> list[Article]:
-        tasks: list[asyncio.Task[list[Article]]] = []
-        for edition_id, edition_name in self.EDITIONS.items():
-            task = asyncio.create_task(self.search_edition(edition_id, edition_name))
-            tasks.append(task)
-            break
-        data = [article for chunk in await asyncio.gather(*tasks) for article in chunk]
-        return data
+        return [article async for article in self.search_stream()]
 
     async def to_csv(
         self,
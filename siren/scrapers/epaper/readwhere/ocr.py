@@ -1,13 +1,19 @@
 from __future__ import annotations
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from .core import BaseReadwhereScraper, PartialArticle
 from datetime import datetime
-from siren.core import Model, ClientProto
-from typing import ClassVar, Self, no_type_check
-from PIL import Image, ImageOps
-from io import BytesIO
+from siren.core import Model, ClientProto, Pipeline, cache_dir
+from typing import Any, ClassVar, Literal, no_type_check
+from PIL import Image
+from .preprocess import Preprocess, TextFilter
+from .store import Hit, OCRStore, Word
+from contextlib import contextmanager
 import asyncio
 import logging
+import os
+import random
+import time
 import pytesseract  # pyright: ignore[reportMissingTypeStubs]
 
 
@@ -16,6 +22,491 @@ import pytesseract  # pyright: ignore[reportMissingTypeStubs]
 logger = logging.getLogger(__name__)
 # reader = easyocr.Reader(["en"])
 
+# Tesseract's OpenMP threads oversubscribe the cores when several OCR threads or processes run at once
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+type Strategy = Literal["tiles", "bands", "page"]
+"""
+How the tiles of a :class:`PageLevel` are grouped before OCR.
+
+`tiles` OCRs every :class:`PageChunk` independently, `bands` stitches each column of tiles
+into a single vertical strip and `page` stitches the whole level into one image.
+"""
+
+
+class OCRStats:
+    """Counters collected while running OCR, used for logging and benchmarks."""
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.preprocess_seconds = 0.0
+        self.pages = 0
+        self.tiles = 0
+        self.skipped = 0
+        self.failed = 0
+        self.audited = 0
+        self.audited_hits = 0
+        self.hits = 0
+        self.lost_hits = 0.0
+
+    @property
+    def seconds_per_page(self) -> float:
+        return self.seconds / self.pages if self.pages else 0.0
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.tiles if self.tiles else 0.0
+
+    @property
+    def skip_recall(self) -> float:
+        """
+        The estimated fraction of keyword hits kept despite skipping.
+
+        `hits` counts the OCR'd groups with a keyword hit. `lost_hits` scales the hits found in audited skips
+        by the audit rate, estimating the hits in all skipped groups.
+        """
+        total = self.hits + self.lost_hits
+        return self.hits / total if total else 1.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<OCRStats calls={self.calls} pages={self.pages} "
+            f"seconds_per_page={self.seconds_per_page:.2f} preprocess_seconds={self.preprocess_seconds:.2f} "
+            f"failed_tiles={self.failed} skip_rate={self.skip_rate:.2%} hits={self.hits} lost_hits~{self.lost_hits:.1f} "
+            f"skip_recall={self.skip_recall:.2%} ({self.audited_hits}/{self.audited} audited skips had hits)>"
+        )
+
+
+class OCROptions(Model):
+    """
+    Options for an :class:`OCRPipeline`.
+
+    Attributes
+    ----------
+
+    level: :class:`str`
+        The resolution level to OCR.
+
+    strategy: :data:`Strategy`
+        How tiles are grouped before OCR.
+
+    preprocess: :class:`Preprocess`
+        Preprocessing applied in the decode stage.
+
+    text_filter: :class:`TextFilter | None`
+        Classifier used to skip tiles without text.
+
+    download_workers: :class:`int`
+        The number of tile groups downloaded concurrently.
+
+    decode_workers: :class:`int`
+        The number of threads decoding and preprocessing images.
+
+    ocr_workers: :class:`int`
+        The number of threads running Tesseract.
+
+    queue_depth: :class:`int`
+        The number of tile groups buffered in front of each stage.
+
+    max_tiles: :class:`int | None`
+        The maximum number of tiles between download and the end of OCR at any time.
+
+    """
+
+    level: str = "level2"
+    strategy: Strategy = "tiles"
+    preprocess: Preprocess = Preprocess()
+    text_filter: TextFilter | None = None
+    download_workers: int = 8
+    decode_workers: int = 1
+    ocr_workers: int = 1
+    queue_depth: int = 4
+    max_tiles: int | None = None
+
+
+def prepare(
+    tiles: list[tuple[PageChunk, bytes]],
+    offsets: dict[tuple[int, int], tuple[int, int]],
+    preprocess: Preprocess,
+    text_filter: TextFilter | None = None,
+    audit: bool = False,
+    group: list[PageChunk] | None = None,
+) -> tuple[Image.Image | None, int, list[PageChunk]]:
+    """
+    Classify, decode, stitch and preprocess a group of downloaded tiles.
+
+    The image covers `group` (defaults to the given tiles), so tiles that failed to download or decode are left blank.
+    Tiles rejected by `text_filter` are left blank in the stitched image too; if every tile is rejected
+    `None` is returned instead, unless `audit` is set.
+    Returns the image along with the number of rejected tiles and the tiles that could not be decoded.
+    """
+    group = group or [c for c, _ in tiles]
+    failed: list[PageChunk] = []
+    kept: list[tuple[PageChunk, bytes]] = []
+    for chunk, data in tiles:
+        try:
+            if not text_filter or text_filter.is_text(data):
+                kept.append((chunk, data))
+        except (OSError, ValueError) as e:  # UnidentifiedImageError is an OSError
+            logger.error(f"Ignoring undecodable tile {chunk.url}: {e!r}")
+            failed.append(chunk)
+    tiles = [(c, d) for c, d in tiles if c not in failed]
+    skipped = len(tiles) - len(kept)
+    if not kept:
+        if not audit:
+            return None, skipped, failed
+        kept = tiles
+    images: list[tuple[PageChunk, Image.Image]] = []
+    for chunk, data in kept:
+        try:
+            images.append((chunk, preprocess.decode(data)))
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring undecodable tile {chunk.url}: {e!r}")
+            failed.append(chunk)
+    if not images:
+        return None, skipped, failed
+    if len(group) == 1:
+        image = images[0][1]
+    else:
+        image = stitch(images, offsets, preprocess.scale, group=group)
+    return preprocess.apply(image), skipped, failed
+
+
+def recognize(
+    image: Image.Image,
+    group: list[PageChunk],
+    offsets: dict[tuple[int, int], tuple[int, int]],
+    scale: float,
+) -> list[Word]:
+    """
+    Run Tesseract on the stitched image of `group`, returning an empty list on failure.
+
+    Word boxes are mapped back to the coordinates of the whole level using `offsets` and `scale`,
+    and every word is attributed to the tile containing its centre.
+    """
+    url = group[0].url
+    logger.info(f"Running OCR on {image.width}*{image.height} image: {url}")
+    try:
+        data: dict[str, list[Any]] = pytesseract.image_to_data(
+            image, output_type=pytesseract.Output.DICT
+        )
+        # buffer = BytesIO()
+        # image.save(buffer, format="jpeg")
+        # buffer.seek(0)
+        # raw = reader.readtext(buffer.read(), detail=0)
+    except (pytesseract.TesseractError, RuntimeError) as e:
+        logger.error(f"Ignoring exception while extracting text from {url}: {e}")
+        return []
+    x0 = min(offsets[c.tx, c.ty][0] for c in group)
+    y0 = min(offsets[c.tx, c.ty][1] for c in group)
+    words: list[Word] = []
+    lines: dict[tuple[int, int, int], int] = {}
+    for i, text in enumerate(data["text"]):
+        if not (text := text.strip()):
+            continue
+        left = x0 + round(data["left"][i] / scale)
+        top = y0 + round(data["top"][i] / scale)
+        width = round(data["width"][i] / scale)
+        height = round(data["height"][i] / scale)
+        cx, cy = left + width // 2, top + height // 2
+        tile = next(
+            (
+                c.url
+                for c in group
+                if offsets[c.tx, c.ty][0] <= cx < offsets[c.tx, c.ty][0] + c.width
+                and offsets[c.tx, c.ty][1] <= cy < offsets[c.tx, c.ty][1] + c.height
+            ),
+            url,
+        )
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        line = lines.setdefault(key, len(lines))
+        conf = float(data["conf"][i])
+        words.append(Word(text, conf, left, top, width, height, line, tile))
+    return words
+
+
+def join(words: list[Word]) -> str:
+    """Join words into text, one line per OCR'd line."""
+    lines: dict[int, list[str]] = {}
+    for word in words:
+        lines.setdefault(word.line, []).append(word.text)
+    return "\n".join(" ".join(line) for line in lines.values())
+
+
+class OCRPage:
+    """A page queued for OCR along with the level to OCR it at and the issue it belongs to."""
+
+    def __init__(self, page: Page, level: str, issue: PartialArticle | None = None):
+        self.page = page
+        self.level = level
+        self.issue = issue
+        self.offsets = getattr(page.levels, level).offsets()
+        self.matches: dict[str, str] = {}
+        self.words: list[Word] = []
+        self.lines = 0
+        self.remaining = 0
+
+    def add(self, words: list[Word]):
+        """Append the words of one OCR'd group, keeping line numbers unique within the page."""
+        self.words.extend(w._replace(line=w.line + self.lines) for w in words)
+        self.lines += len({w.line for w in words})
+
+
+class OCRJob:
+    """A group of chunks of a single page that is OCR'd as one image."""
+
+    def __init__(self, page: OCRPage, group: list[PageChunk]):
+        self.page = page
+        self.group = group
+        self.tiles: list[tuple[PageChunk, bytes]] = []
+        self.failed: list[PageChunk] = []
+        self.image: Image.Image | None = None
+        self.audit = False
+        self.audit_rate = 0.0
+        self.permits = 0
+        self.words: list[Word] = []
+
+    @property
+    def url(self) -> str:
+        return self.group[0].url
+
+
+class TileBudget:
+    """
+    Bounds the number of tiles between download and the end of OCR.
+
+    A group's tiles are taken in one step: taking them one permit at a time lets several download workers
+    each hold part of the budget while waiting for the rest, and none of them ever gets it.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self, tiles: int) -> int:
+        """Wait until `tiles` tiles (at most the whole budget) fit, take them, and return how many were taken."""
+        tiles = min(tiles, self.limit)
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.used + tiles <= self.limit)
+            self.used += tiles
+        return tiles
+
+    async def release(self, tiles: int):
+        async with self.condition:
+            self.used -= tiles
+            self.condition.notify_all()
+
+
+class OCRPipeline:
+    """
+    Runs OCR over pages as three stages connected by bounded queues:
+    tile download (async), decode and preprocess (thread pool), and Tesseract (thread pool).
+
+    Downloads for later tiles overlap with OCR of earlier ones, while the queue depth bounds
+    how many downloaded tiles are held in memory at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: ClientProto,
+        keywords: list[str],
+        options: OCROptions = OCROptions(),
+        stats: OCRStats | None = None,
+        decode_pool: Executor | None = None,
+        ocr_pool: Executor | None = None,
+    ):
+        self.client = client
+        self.keywords = keywords
+        self.options = options
+        self.stats = stats or OCRStats()
+        self.decode_pool = decode_pool
+        self.ocr_pool = ocr_pool
+        self.budget = TileBudget(options.max_tiles) if options.max_tiles else None
+
+    def replace(self, **options: Any) -> OCRPipeline:
+        """Return a pipeline sharing this one's client, stats and pools with some options replaced."""
+        return OCRPipeline(
+            client=self.client,
+            keywords=self.keywords,
+            options=self.options.model_copy(update=options),
+            stats=self.stats,
+            decode_pool=self.decode_pool,
+            ocr_pool=self.ocr_pool,
+        )
+
+    async def download(self, job: OCRJob) -> OCRJob:
+        if self.budget:
+            job.permits = await self.budget.acquire(len(job.group))
+        data = await asyncio.gather(*(self.fetch(chunk) for chunk in job.group))
+        job.tiles = [(c, d) for c, d in zip(job.group, data) if d is not None]
+        self.fail(job, [c for c, d in zip(job.group, data) if d is None])
+        return job
+
+    async def fetch(self, chunk: PageChunk) -> bytes | None:
+        try:
+            return await chunk.download(client=self.client)
+        except Exception as e:
+            logger.error(f"Ignoring exception while downloading {chunk.url}: {e!r}")
+            return None
+
+    def fail(self, job: OCRJob, chunks: list[PageChunk]):
+        """Record `chunks` of `job` as failed; they are left out of the OCR'd image."""
+        job.failed.extend(chunks)
+        self.stats.failed += len(chunks)
+
+    async def decode(self, job: OCRJob) -> OCRJob:
+        if not job.tiles:
+            return job
+        text_filter = self.options.text_filter
+        job.audit_rate = getattr(text_filter, "audit", 0.0)
+        job.audit = bool(text_filter) and random.random() < job.audit_rate
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            job.image, skipped, failed = await loop.run_in_executor(
+                self.decode_pool,
+                prepare,
+                job.tiles,
+                job.page.offsets,
+                self.options.preprocess,
+                text_filter,
+                job.audit,
+                job.group,
+            )
+        except Exception as e:
+            logger.error(f"Ignoring exception while decoding {job.url}: {e!r}")
+            self.fail(job, [c for c, _ in job.tiles])
+            job.tiles = []
+            return job
+        self.stats.preprocess_seconds += time.perf_counter() - start
+        self.fail(job, failed)
+        self.stats.tiles += len(job.tiles)
+        self.stats.skipped += skipped
+        job.audit = job.audit and skipped >= len(job.tiles) - len(failed)
+        job.tiles = []  # the encoded tiles are no longer needed
+        return job
+
+    async def recognize(self, job: OCRJob) -> OCRJob:
+        try:
+            if job.image is not None:
+                await self._recognize(job)
+        except Exception as e:
+            logger.error(f"Ignoring exception while running OCR on {job.url}: {e!r}")
+            job.image = None
+            self.fail(job, job.group)
+        finally:
+            if self.budget and job.permits:
+                await self.budget.release(job.permits)
+                job.permits = 0
+        return job
+
+    async def _recognize(self, job: OCRJob):
+        assert job.image is not None
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        words = await loop.run_in_executor(
+            self.ocr_pool,
+            recognize,
+            job.image,
+            job.group,
+            job.page.offsets,
+            self.options.preprocess.scale,
+        )
+        job.image = None
+        self.stats.calls += 1
+        self.stats.seconds += time.perf_counter() - start
+        flat = " ".join(w.text.lower() for w in words)
+        hit = any(kw.lower() in flat for kw in self.keywords)
+        if job.audit:
+            self.stats.audited += 1
+            self.stats.audited_hits += hit
+            self.stats.lost_hits += hit / job.audit_rate
+        else:
+            self.stats.hits += hit
+            job.words = words
+
+    async def run(
+        self, pages: Iterable[OCRPage] | AsyncIterable[OCRPage]
+    ) -> AsyncIterator[tuple[OCRPage, PageResult]]:
+        """Yield a :class:`PageResult` for each page as soon as all of its tiles have been OCR'd."""
+        options = self.options
+
+        async def jobs() -> AsyncIterator[OCRJob]:
+            async for page in _aiter(pages):
+                level: PageLevel = getattr(page.page.levels, page.level)
+                groups = level.groups(options.strategy) or [[]]
+                page.remaining = len(groups)
+                for group in groups:
+                    yield OCRJob(page, group)
+
+        pipeline = (
+            Pipeline(jobs())
+            .stage(
+                self.download,
+                workers=options.download_workers,
+                maxsize=options.queue_depth,
+            )
+            .stage(
+                self.decode, workers=options.decode_workers, maxsize=options.queue_depth
+            )
+            .stage(
+                self.recognize, workers=options.ocr_workers, maxsize=options.queue_depth
+            )
+        )
+        async for job in pipeline:
+            page = job.page
+            if job.words:
+                page.matches[job.url] = join(job.words)
+                page.add(job.words)
+            page.remaining -= 1
+            if not page.remaining:
+                self.stats.pages += 1
+                yield page, PageResult(page=page.page, matches=page.matches)
+
+    async def search(self, pages: Iterable[Page]) -> list[PageResult]:
+        """Return the :class:`PageResult` of every page, in the order given."""
+        queued = [OCRPage(page, self.options.level) for page in pages]
+        results = {id(page): result async for page, result in self.run(queued)}
+        return [results[id(page)] for page in queued]
+
+
+async def _aiter[T](items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def stitch(
+    tiles: list[tuple[PageChunk, Image.Image]],
+    offsets: dict[tuple[int, int], tuple[int, int]],
+    scale: float = 1.0,
+    *,
+    group: list[PageChunk] | None = None,
+) -> Image.Image:
+    """
+    Paste decoded tiles onto a single grayscale canvas covering `group` (defaults to the given tiles).
+
+    Tiles are positioned by their `offsets` within the level (see :meth:`PageLevel.offsets`) multiplied by `scale`,
+    so tiles missing from `tiles` leave a blank gap instead of shifting the rest of the layout.
+    """
+    group = group or [chunk for chunk, _ in tiles]
+    x0 = min(offsets[c.tx, c.ty][0] for c in group)
+    y0 = min(offsets[c.tx, c.ty][1] for c in group)
+    x1 = max(offsets[c.tx, c.ty][0] + c.width for c in group)
+    y1 = max(offsets[c.tx, c.ty][1] + c.height for c in group)
+    size = (round((x1 - x0) * scale), round((y1 - y0) * scale))
+    canvas = Image.new("L", size, 255)
+    for chunk, image in tiles:
+        x, y = offsets[chunk.tx, chunk.ty]
+        canvas.paste(image, (round((x - x0) * scale), round((y - y0) * scale)))
+    return canvas
+
 
 class PageChunk(Model):
     tx: int
@@ -24,36 +515,13 @@ class PageChunk(Model):
     height: int
     url: str
 
-    async def search(
-        self, *, client: ClientProto, keywords: list[str]
-    ) -> tuple[Self, str]:
-        """Return a list of strings found from the keywords list"""
+    async def download(self, *, client: ClientProto) -> bytes | None:
+        """Download the encoded image of this chunk, or return `None` if the server did not return it."""
         resp = await client.get(self.url)
-        buf = BytesIO(resp.content)
-        image = Image.open(buf).convert(
-            "RGBA"
-        )  # pyright: ignore[reportUnknownMemberType]
-        image = ImageOps.grayscale(image)
-        logger.info(f"Running OCR on {image.width}*{image.height} chunk: {self.url}")
-        try:
-            text: str = await asyncio.to_thread(pytesseract.image_to_string, image)
-            # buffer = BytesIO()
-            # image.save(buffer, format="jpeg")
-            # buffer.seek(0)
-            # raw = await asyncio.to_thread(reader.readtext, buffer.read(), detail=0)
-            # text: str = " ".join(raw)
-        except (pytesseract.TesseractError, RuntimeError) as e:
-            logger.error(
-                f"Ignoring exception while extracting text from {self.url}: {e}"
-            )
-            text = ""
-        # split = text.lower().split()
-        # items: list[str] = split
-        # # for kw in keywords:
-        # #     for word in split:
-        # #         if kw == word:
-        # #             items.append(word)
-        return self, text
+        if resp.status_code != 200:
+            logger.warning(f"Could not download tile {self.url}: {resp.status_code}")
+            return None
+        return resp.content
 
 
 class PageLevel(Model):
@@ -61,6 +529,40 @@ class PageLevel(Model):
     height: int
     chunks: list[PageChunk]
 
+    def offsets(self) -> dict[tuple[int, int], tuple[int, int]]:
+        """
+        Return the (x, y) pixel offset of every chunk within this level, keyed by (`tx`, `ty`).
+
+        Offsets are the cumulative widths of the columns to the left and heights of the rows above,
+        so they do not depend on whether the grid indices are tile counts or pixel offsets.
+        """
+        widths: dict[int, int] = {}
+        heights: dict[int, int] = {}
+        for chunk in self.chunks:
+            widths[chunk.tx] = max(widths.get(chunk.tx, 0), chunk.width)
+            heights[chunk.ty] = max(heights.get(chunk.ty, 0), chunk.height)
+        left: dict[int, int] = {}
+        top: dict[int, int] = {}
+        x = y = 0
+        for tx in sorted(widths):
+            left[tx], x = x, x + widths[tx]
+        for ty in sorted(heights):
+            top[ty], y = y, y + heights[ty]
+        return {(c.tx, c.ty): (left[c.tx], top[c.ty]) for c in self.chunks}
+
+    def groups(self, strategy: Strategy = "tiles") -> list[list[PageChunk]]:
+        """Group the chunks of this level into the units that are OCR'd together."""
+        match strategy:
+            case "tiles":
+                return [[chunk] for chunk in self.chunks]
+            case "bands":
+                bands: dict[int, list[PageChunk]] = {}
+                for chunk in self.chunks:
+                    bands.setdefault(chunk.tx, []).append(chunk)
+                return [bands[tx] for tx in sorted(bands)]
+            case "page":
+                return [self.chunks] if self.chunks else []
+
 
 class Levels(Model):
     thumbs: PageLevel
@@ -70,44 +572,65 @@ class Levels(Model):
     level2: PageLevel
     header: PageLevel
 
+    OCR_LEVELS: ClassVar = ("level0", "leveldefault", "level1", "level2")
+
+    def ranked(self) -> list[str]:
+        """Return the names of the OCR-able levels, from the lowest resolution to the highest."""
+        return sorted(
+            self.OCR_LEVELS, key=lambda name: getattr(self, name).width
+        )
+
 
 class Page(Model):
     key: str
     pagenum: int
     levels: Levels
 
-    async def search(self, *, keywords: list[str], client: ClientProto) -> PageResult:
+    async def search(
+        self,
+        *,
+        keywords: list[str],
+        client: ClientProto,
+        options: OCROptions = OCROptions(),
+        stats: OCRStats | None = None,
+    ) -> PageResult:
         """Return a `PageResult` containing self (the page in which matches were found) and a mapping of url to a list of the matches found in the corresponding image."""
-        target = self.levels.level2
-        matches: dict[str, str] = {}
-        tasks: list[asyncio.Task[tuple[PageChunk, str]]] = []
-        for chunk in target.chunks:
-            task = asyncio.create_task(chunk.search(keywords=keywords, client=client))
-            tasks.append(task)
-        for fut in asyncio.as_completed(tasks):
-            chunk, found = await fut
-            if found:
-                matches[chunk.url] = found
-        return PageResult(page=self, matches=matches)
+        pipeline = OCRPipeline(
+            client=client, keywords=keywords, options=options, stats=stats
+        )
+        [result] = await pipeline.search([self])
+        return result
 
 
 class PageResult(Model):
     page: Page
     matches: dict[str, str]
 
+    @property
+    def words(self) -> set[str]:
+        return {word for text in self.matches.values() for word in text.lower().split()}
+
+    def found(self, keywords: list[str]) -> set[str]:
+        """Return the keywords that appear in the OCR'd text of this page."""
+        text = " ".join(" ".join(t.lower().split()) for t in self.matches.values())
+        return {kw for kw in keywords if kw.lower() in text}
+
 
 class PageMeta(Model):
     pages: dict[str, Page]
 
     async def search(
-        self, *, keywords: list[str], client: ClientProto
+        self,
+        *,
+        keywords: list[str],
+        client: ClientProto,
+        options: OCROptions = OCROptions(),
+        stats: OCRStats | None = None,
     ) -> list[PageResult]:
-        tasks: list[asyncio.Task[PageResult]] = []
-        for _page_number, page in self.pages.items():
-            tasks.append(
-                asyncio.create_task(page.search(keywords=keywords, client=client))
-            )
-        return await asyncio.gather(*tasks)
+        pipeline = OCRPipeline(
+            client=client, keywords=keywords, options=options, stats=stats
+        )
+        return await pipeline.search(self.pages.values())
 
 
 class Result(Model):
@@ -150,13 +673,213 @@ class PartialArticleOCR:
         resp = await client.get(str(url))
         return PageMeta(pages=resp.json())
 
-    async def search(self, client: ClientProto, keywords: list[str]):
-        meta = await self.get_pagemeta(client=client)
-        pages = await meta.search(keywords=keywords, client=client)
+    async def search(
+        self,
+        client: ClientProto,
+        keywords: list[str],
+        *,
+        options: OCROptions = OCROptions(),
+        stats: OCRStats | None = None,
+        meta: PageMeta | None = None,
+    ):
+        meta = meta or await self.get_pagemeta(client=client)
+        pages = await meta.search(
+            keywords=keywords, client=client, options=options, stats=stats
+        )
         return Result(pages=pages, partial=self.partial)
 
 
+async def select_level(page: Page, *, pipeline: OCRPipeline, target: float) -> str:
+    """
+    Return the lowest resolution level of `page` whose OCR'd words recall at least `target`
+    of the words found at the highest resolution level.
+    """
+    *candidates, best = page.levels.ranked()
+    [reference] = await pipeline.replace(level=best, text_filter=None).search([page])
+    if not reference.words:
+        return best
+    for level in candidates:
+        [result] = await pipeline.replace(level=level, text_filter=None).search([page])
+        recall = len(result.words & reference.words) / len(reference.words)
+        logger.info(f"OCR recall for {level} on page {page.key}: {recall:.2%}")
+        if recall >= target:
+            return level
+    return best
+
+
+class OCRScheduler:
+    """
+    Schedules OCR for every issue of every edition of a :class:`BaseReadwhereScraperOCR`.
+
+    All pages flow through a single :class:`OCRPipeline` backed by the scraper's dedicated thread pools,
+    so the number of pages and tiles in flight is bounded globally by `MAX_PAGES` and `MAX_TILES`
+    rather than per issue. Results are yielded per issue as soon as its last page is done,
+    and the positional OCR output of every page is written to `store` if given.
+    """
+
+    def __init__(
+        self,
+        scraper: BaseReadwhereScraperOCR,
+        editions: dict[str, str],
+        store: OCRStore | None = None,
+    ):
+        self.scraper = scraper
+        self.editions = editions
+        self.store = store
+        self.pipeline = scraper.pipeline(scraper.ocr_options())
+        self.pages = asyncio.Semaphore(scraper.MAX_PAGES)
+        self.pending: dict[int, list[PageResult | None]] = {}
+        self.empty: list[PartialArticle] = []
+        self.total = 0
+        self.done = 0
+        self.started = time.perf_counter()
+
+    async def issues(self) -> list[tuple[str, PartialArticle]]:
+        async def fetch(edition_id: str, edition_name: str):
+            try:
+                partials = await self.scraper.get_partial_articles(
+                    edition_id, edition_name
+                )
+            except Exception as e:
+                logger.error(f"Ignoring exception while listing {edition_name}: {e}")
+                return []
+            return [(edition_id, partial) for partial in partials]
+
+        chunks = await asyncio.gather(
+            *(fetch(id, name) for id, name in self.editions.items())
+        )
+        return [issue for chunk in chunks for issue in chunk]
+
+    async def queue(
+        self, issues: list[tuple[str, PartialArticle]]
+    ) -> AsyncIterator[OCRPage]:
+        for edition_id, partial in issues:
+            try:
+                meta = await PartialArticleOCR(partial).get_pagemeta(
+                    client=self.scraper.http
+                )
+                level = await self.scraper.get_level(edition_id, meta, self.pipeline)
+            except Exception as e:
+                logger.error(f"Ignoring exception while queueing {partial.url}: {e}")
+                self.total -= 1
+                continue
+            if not meta.pages:
+                self.empty.append(partial)
+                continue
+            self.pending[id(partial)] = [None] * len(meta.pages)
+            for page in meta.pages.values():
+                await self.pages.acquire()
+                yield OCRPage(page, level, partial)
+
+    def progress(self):
+        hours = (time.perf_counter() - self.started) / 3600
+        rate = self.done / hours if hours else 0.0
+        logger.info(
+            f"OCR progress for {self.scraper.__class__.__name__}: {self.done}/{self.total} issues "
+            f"({rate:.1f} issues/hour) {self.pipeline.stats}"
+        )
+
+    async def run(self) -> AsyncIterator[Result]:
+        """Yield a :class:`Result` for each issue as soon as all of its pages have been OCR'd."""
+        issues = await self.issues()
+        self.total = len(issues)
+        logger.info(f"Scheduling OCR for {self.total} issues")
+        async for page, result in self.pipeline.run(self.queue(issues)):
+            self.pages.release()
+            assert page.issue is not None
+            if self.store:
+                self.store.add_page(page.issue, page.page, page.level, page.words)
+                page.words = []
+            results = self.pending[id(page.issue)]
+            results[results.index(None)] = result
+            if None not in results:
+                del self.pending[id(page.issue)]
+                if self.store:
+                    self.store.commit()
+                self.done += 1
+                self.progress()
+                pages = sorted(
+                    (r for r in results if r), key=lambda r: r.page.pagenum
+                )
+                yield Result(pages=pages, partial=page.issue)
+        for partial in self.empty:
+            yield Result(pages=[], partial=partial)
+
+
 class BaseReadwhereScraperOCR(BaseReadwhereScraper):
+    WORKLOAD = "ocr"
+
+    OCR_STRATEGY: ClassVar[Strategy] = "tiles"
+    """How tiles are grouped before OCR, see :data:`Strategy`."""
+
+    OCR_LEVEL: ClassVar[str | None] = "level2"
+    """The resolution level to OCR. If `None`, the lowest level meeting `ACCURACY_TARGET` is chosen per edition."""
+
+    ACCURACY_TARGET: ClassVar[float] = 0.9
+    """The fraction of highest-resolution words a lower level must recall to be selected."""
+
+    PREPROCESS: ClassVar[Preprocess] = Preprocess()
+    """Preprocessing applied to every image in the OCR worker before running Tesseract."""
+
+    TEXT_FILTER: ClassVar[TextFilter | None] = None
+    """
+    Classifier used to skip tiles without text, e.g. `TextFilter()`. Off until its recall is measured,
+    see :attr:`OCRStats.skip_recall`.
+    """
+
+    DOWNLOAD_WORKERS: ClassVar[int] = 8
+    """The number of tile groups downloaded concurrently."""
+
+    DECODE_WORKERS: ClassVar[int] = 1
+    """The number of threads decoding and preprocessing tiles."""
+
+    OCR_WORKERS: ClassVar[int] = 1
+    """
+    The number of threads running Tesseract. Multithreaded pytesseract timed out or crashed on
+    GitHub Actions in the README benchmarks, so raise this only where it has been measured.
+    """
+
+    QUEUE_DEPTH: ClassVar[int] = 4
+    """The number of tile groups buffered between stages."""
+
+    MAX_PAGES: ClassVar[int] = 8
+    """The maximum number of pages being OCR'd at once across all editions."""
+
+    MAX_TILES: ClassVar[int | None] = 64
+    """The maximum number of tiles held between download and the end of OCR across all editions."""
+
+    OCR_STORE: ClassVar[bool] = True
+    """Whether to keep positional OCR output in the site's :class:`OCRStore` for offline re-searching."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.stats = OCRStats()
+        self.levels: dict[int | str, str] = {}
+        self.decode_pool: ThreadPoolExecutor | None = None
+        self.ocr_pool: ThreadPoolExecutor | None = None
+
+    def ocr_options(self, level: str = "level2") -> OCROptions:
+        return OCROptions(
+            level=level,
+            strategy=self.OCR_STRATEGY,
+            preprocess=self.PREPROCESS,
+            text_filter=self.TEXT_FILTER,
+            download_workers=self.DOWNLOAD_WORKERS,
+            decode_workers=self.DECODE_WORKERS,
+            ocr_workers=self.OCR_WORKERS,
+            queue_depth=self.QUEUE_DEPTH,
+            max_tiles=self.MAX_TILES,
+        )
+
+    def pipeline(self, options: OCROptions) -> OCRPipeline:
+        return OCRPipeline(
+            client=self.http,
+            keywords=self.keywords,
+            options=options,
+            stats=self.stats,
+            decode_pool=self.decode_pool,
+            ocr_pool=self.ocr_pool,
+        )
 
     async def get_partial_articles_ocr(
         self,
@@ -172,35 +895,62 @@ class BaseReadwhereScraperOCR(BaseReadwhereScraper):
             )
         ]
 
+    async def get_level(
+        self, edition_id: int | str, meta: PageMeta, pipeline: OCRPipeline
+    ) -> str:
+        """Return the level to OCR for this edition, calibrating it on the first page if needed."""
+        if self.OCR_LEVEL:
+            return self.OCR_LEVEL
+        if level := self.levels.get(edition_id):
+            return level
+        if not meta.pages:
+            return "level2"
+        page = next(iter(meta.pages.values()))
+        level = await select_level(
+            page, pipeline=pipeline, target=self.ACCURACY_TARGET
+        )
+        logger.info(f"Selected {level} for edition {edition_id}")
+        self.levels[edition_id] = level
+        return level
+
+    def open_store(self) -> OCRStore:
+        """Open the :class:`OCRStore` of this scraper's site."""
+        path = cache_dir("ocr") / f"{self.BASE_URL.host}.sqlite3"
+        return OCRStore(path, site=str(self.BASE_URL))
+
+    @contextmanager
+    def executors(self):
+        """Create the thread pools dedicated to decoding and OCR, leaving the event loop's default executor alone."""
+        with (
+            ThreadPoolExecutor(self.DECODE_WORKERS, "decode") as self.decode_pool,
+            ThreadPoolExecutor(self.OCR_WORKERS, "ocr") as self.ocr_pool,
+        ):
+            try:
+                yield
+            finally:
+                self.decode_pool = self.ocr_pool = None
+
+    async def run_scheduler(self, editions: dict[str, str]) -> list[Result]:
+        store = self.open_store() if self.OCR_STORE else None
+        try:
+            with self.executors():
+                scheduler = OCRScheduler(self, editions, store)
+                return [result async for result in scheduler.run()]
+        finally:
+            if store:
+                store.close()
+
     async def search_edition_ocr(
-        self, edition_id: int | str, edition_name: str
+        self, edition_id: str, edition_name: str
     ) -> list[Result]:
         logger.info(f"Scraping edition {edition_name}!")
-        partials = await self.get_partial_articles_ocr(edition_id, edition_name)
-        tasks: list[asyncio.Task[Result]] = []
-        for partial in partials:
-            task = asyncio.create_task(
-                partial.search(client=self.http, keywords=self.keywords)
-            )
-            tasks.append(task)
-            break  # TODO: remove after benchmarking
-        return await asyncio.gather(*tasks)
+        return await self.run_scheduler({edition_id: edition_name})
 
     @no_type_check
     async def scrape(self) -> list[Result]:
-        with ThreadPoolExecutor(max_workers=1) as pool:
-            asyncio.get_event_loop().set_default_executor(pool)
-            tasks: list[asyncio.Task[list[Result]]] = []
-            for edition_id, edition_name in self.EDITIONS.items():
-                task = asyncio.create_task(
-                    self.search_edition_ocr(edition_id, edition_name)
-                )
-                tasks.append(task)
-                break  # TODO: remove after benchmarking
-            data = [
-                article for chunk in await asyncio.gather(*tasks) for article in chunk
-            ]
-            return data
+        data = await self.run_scheduler(self.EDITIONS)
+        logger.info(f"{self.__class__.__name__} OCR stats: {self.stats}")
+        return data
 
     async def to_csv(
         self,
@@ -212,3 +962,32 @@ class BaseReadwhereScraperOCR(BaseReadwhereScraper):
         include.add("url")
         exclude.add("base_url")
         return await super().to_csv(include=include, exclude=exclude, aliases=aliases)
+
+
+class BaseReadwhereScraperOCRIndex(BaseReadwhereScraperOCR):
+    """
+    Answers keyword searches from the site's :class:`OCRStore` instead of running OCR.
+    Only issues previously OCR'd by the corresponding OCR scraper are covered, so it is not part of `--scraper all`.
+    """
+
+    WORKLOAD = "io"
+    RUN_ALL = False
+
+    @no_type_check
+    async def scrape(self) -> list[Hit]:
+        store = self.open_store()
+        try:
+            hits: list[Hit] = []
+            for keyword in self.keywords:
+                hits.extend(
+                    store.search(
+                        keyword,
+                        start=self.start,
+                        end=self.end,
+                        editions=list(self.EDITIONS),
+                    )
+                )
+            logger.info(f"Found {len(hits)} hits in {store.path}")
+            return hits
+        finally:
+            store.close()
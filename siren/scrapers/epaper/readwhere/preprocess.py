@@ -0,0 +1,177 @@
+"""
+Vectorized image preprocessing for the Readwhere OCR path.
+
+Everything here is synchronous and meant to run inside the OCR worker thread,
+right before the image is handed to Tesseract.
+"""
+
+from __future__ import annotations
+from io import BytesIO
+from PIL import Image
+from siren.core import Model
+import numpy as np
+import numpy.typing as npt
+
+type Array = npt.NDArray[np.uint8]
+
+
+def decode(data: bytes, scale: float = 1.0) -> Image.Image:
+    """
+    Decode an image straight to grayscale at `scale` of its size.
+
+    For JPEGs, :meth:`PIL.Image.Image.draft` lets libjpeg decode directly to luminance at a reduced
+    DCT scale, so downscaled tiles are never materialised at full size.
+    """
+    image = Image.open(BytesIO(data))
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    if scale < 1:
+        image.draft("L", size)
+    image = image.convert("L")
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def box_sum(array: Array, window: int) -> npt.NDArray[np.int32]:
+    """Return the sum of every `window`-sized square around each pixel, clipped at the borders."""
+    h, w = array.shape
+    half = window // 2
+    y0 = np.clip(np.arange(h) - half, 0, h)
+    y1 = np.clip(np.arange(h) + half + 1, 0, h)
+    x0 = np.clip(np.arange(w) - half, 0, w)
+    x1 = np.clip(np.arange(w) + half + 1, 0, w)
+    cols = np.zeros((h + 1, w), dtype=np.int32)
+    cols[1:] = array.cumsum(0, dtype=np.int32)
+    rows = np.zeros((h, w + 1), dtype=np.int32)
+    rows[:, 1:] = (cols[y1] - cols[y0]).cumsum(1, dtype=np.int32)
+    return rows[:, x1] - rows[:, x0]
+
+
+def binarize(array: Array, window: int = 31, k: float = 0.15) -> Array:
+    """
+    Adaptive (Bradley) thresholding using running sums.
+
+    A pixel becomes black if it is more than `k` darker than the mean of the `window`-sized square around it,
+    which copes with the uneven illumination and yellowed paper of scanned pages far better than a global threshold.
+    """
+    h, w = array.shape
+    half = window // 2
+    height = np.minimum(np.arange(h) + half + 1, h) - np.maximum(np.arange(h) - half, 0)
+    width = np.minimum(np.arange(w) + half + 1, w) - np.maximum(np.arange(w) - half, 0)
+    area = height[:, None] * width[None, :]
+    dark = array * area <= box_sum(array, window) * (1.0 - k)
+    return np.where(dark, 0, 255).astype(np.uint8)
+
+
+def skew_angle(array: Array, max_angle: float = 5.0, step: float = 0.5) -> float:
+    """
+    Estimate the skew of a (binarized) text image in degrees.
+
+    The image is rotated through candidate angles and the angle whose horizontal projection profile
+    has the highest variance wins, since aligned text lines produce sharp alternating peaks and valleys.
+    """
+    image = Image.fromarray(255 - array)
+    image.thumbnail((800, 800))
+    best, best_score = 0.0, -1.0
+    for angle in np.arange(-max_angle, max_angle + step, step):
+        rotated = np.asarray(image.rotate(float(angle), resample=Image.Resampling.NEAREST))
+        profile = rotated.sum(axis=1, dtype=np.int64)
+        score = float(np.var(profile))
+        if score > best_score:
+            best, best_score = float(angle), score
+    return best
+
+
+class Preprocess(Model):
+    """
+    Preprocessing options applied to every image before OCR.
+
+    Attributes
+    ----------
+
+    scale: :class:`float`
+        Downscale factor applied while decoding. Defaults to 1.0 (no downscaling).
+
+    binarize: :class:`bool`
+        Whether to apply adaptive thresholding. Defaults to False.
+
+    window: :class:`int`
+        The window size (in pixels) used for adaptive thresholding.
+
+    k: :class:`float`
+        How much darker than its neighbourhood a pixel must be to be considered ink.
+
+    deskew: :class:`bool`
+        Whether to estimate and correct the skew of the image. Defaults to False.
+
+    """
+
+    scale: float = 1.0
+    binarize: bool = False
+    window: int = 31
+    k: float = 0.15
+    deskew: bool = False
+
+    def decode(self, data: bytes) -> Image.Image:
+        return decode(data, self.scale)
+
+    def apply(self, image: Image.Image) -> Image.Image:
+        """Apply binarization and deskewing to a decoded grayscale image."""
+        if not (self.binarize or self.deskew):
+            return image
+        array: Array = np.asarray(image, dtype=np.uint8)
+        if self.binarize:
+            array = binarize(array, self.window, self.k)
+        if self.deskew:
+            if angle := skew_angle(array if self.binarize else binarize(array)):
+                return Image.fromarray(array).rotate(
+                    angle, resample=Image.Resampling.BILINEAR, fillcolor=255
+                )
+        return Image.fromarray(array)
+
+
+class TextFilter(Model):
+    """
+    A cheap classifier that decides whether a tile is worth running OCR on.
+
+    Tiles are decoded at `scale` of their size and rejected if they are nearly uniform (margins, whitespace),
+    have too few sharp horizontal edges (photos, gradients) or lack the alternating ink/gap rows that lines
+    of text produce in the horizontal projection profile (solid ads, big blocks of colour).
+
+    Attributes
+    ----------
+
+    scale: :class:`float`
+        The downscale factor used while decoding tiles for classification.
+
+    min_std: :class:`float`
+        The minimum standard deviation of pixel intensities.
+
+    min_edges: :class:`float`
+        The minimum fraction of pixels with a strong horizontal gradient.
+
+    min_lines: :class:`int`
+        The minimum number of ink-to-gap transitions in the horizontal projection profile.
+
+    audit: :class:`float`
+        The fraction of rejected tiles that are OCR'd anyway to estimate the recall lost by skipping.
+
+    """
+
+    scale: float = 0.25
+    min_std: float = 8.0
+    min_edges: float = 0.01
+    min_lines: int = 2
+    audit: float = 0.05
+
+    def is_text(self, data: bytes) -> bool:
+        array: Array = np.asarray(decode(data, self.scale), dtype=np.uint8)
+        if array.size == 0 or float(array.std()) < self.min_std:
+            return False
+        gradient = np.abs(np.diff(array.astype(np.int16), axis=1))
+        if float((gradient > 48).mean()) < self.min_edges:
+            return False
+        ink = (binarize(array, window=15) == 0).mean(axis=1)
+        rows = ink > max(0.02, float(ink.mean()) / 2)
+        lines = int(np.count_nonzero(rows[:-1] & ~rows[1:]))
+        return lines >= self.min_lines
@@ -0,0 +1,324 @@
+"""
+Positional OCR text store for the Readwhere OCR scrapers.
+
+Every OCR'd word is kept with its confidence, bounding box (in the coordinates of the OCR'd level),
+tile, page and issue in SQLite, along with an inverted index from normalised terms to word positions.
+New keyword sets can then be answered from disk without running OCR again.
+"""
+
+from __future__ import annotations
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
+from PIL import Image
+from siren.core import Model, ClientProto
+
+if TYPE_CHECKING:
+    from .core import PartialArticle
+    from .ocr import Page
+
+
+TOKEN = re.compile(r"[^\w]+")
+
+
+def normalize(word: str) -> str:
+    """Lowercase a word and strip punctuation so it can be used as an index term."""
+    return TOKEN.sub("", word.lower())
+
+
+def isoformat(dt: datetime) -> str:
+    """Format `dt` as a naive UTC ISO timestamp so stored dates compare correctly as strings."""
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
+
+class Word(NamedTuple):
+    text: str
+    conf: float
+    left: int
+    top: int
+    width: int
+    height: int
+    line: int
+    tile: str
+
+
+class Hit(Model):
+    """A keyword match found in the store."""
+
+    FIELDS: ClassVar = [
+        "url",
+        "date",
+        "edition",
+        "pagenum",
+        "keyword",
+        "text",
+        "box",
+        "tile",
+    ]
+
+    keyword: str
+    issue_id: str
+    url: str
+    edition: str
+    date: datetime
+    page_key: str
+    pagenum: int
+    level: str
+    text: str
+    tile: str
+    box: tuple[int, int, int, int]
+    """The (left, top, right, bottom) box of the match in the coordinates of `level`."""
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    edition_id TEXT NOT NULL,
+    edition_name TEXT NOT NULL,
+    published TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    issue_id TEXT NOT NULL REFERENCES issues(id),
+    key TEXT NOT NULL,
+    pagenum INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    UNIQUE (issue_id, key)
+);
+CREATE TABLE IF NOT EXISTS tiles (
+    id INTEGER PRIMARY KEY,
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    url TEXT NOT NULL UNIQUE,
+    tx INTEGER NOT NULL,
+    ty INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS words (
+    page_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    term_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    conf REAL NOT NULL,
+    left INTEGER NOT NULL,
+    top INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    tile_id INTEGER NOT NULL,
+    PRIMARY KEY (page_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_term ON words (term_id);
+"""
+
+
+class OCRStore:
+    """
+    SQLite-backed store of positional OCR output.
+
+    Parameters
+    ----------
+
+    path: :class:`pathlib.Path`
+        The database file. It is created if it does not exist.
+
+    site: :class:`str`
+        The Readwhere site this store belongs to, e.g. the scraper's `BASE_URL`.
+
+    """
+
+    def __init__(self, path: Path, *, site: str):
+        self.path = path
+        self.site = site
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.terms: dict[str, int] = dict(self.db.execute("SELECT term, id FROM terms"))
+
+    def close(self):
+        self.db.close()
+
+    def term_id(self, term: str) -> int:
+        if (id := self.terms.get(term)) is None:
+            id = self.db.execute(
+                "INSERT INTO terms (term) VALUES (?)", (term,)
+            ).lastrowid
+            assert id is not None
+            self.terms[term] = id
+        return id
+
+    def add_page(
+        self, issue: PartialArticle, page: Page, level: str, words: list[Word]
+    ):
+        """Replace the stored words of `page` (OCR'd at `level`) with `words`."""
+        db = self.db
+        db.execute(
+            "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                str(issue.id),
+                self.site,
+                str(issue.url),
+                str(issue.edition_id),
+                issue.edition_name,
+                isoformat(issue.published),
+            ),
+        )
+        if row := db.execute(
+            "SELECT id FROM pages WHERE issue_id = ? AND key = ?",
+            (str(issue.id), page.key),
+        ).fetchone():
+            page_id: int = row[0]
+            db.execute("DELETE FROM words WHERE page_id = ?", (page_id,))
+            db.execute("DELETE FROM tiles WHERE page_id = ?", (page_id,))
+            db.execute("UPDATE pages SET level = ? WHERE id = ?", (level, page_id))
+        else:
+            cursor = db.execute(
+                "INSERT INTO pages (issue_id, key, pagenum, level) VALUES (?, ?, ?, ?)",
+                (str(issue.id), page.key, page.pagenum, level),
+            )
+            assert cursor.lastrowid is not None
+            page_id = cursor.lastrowid
+        tiles: dict[str, int] = {}
+        for chunk in getattr(page.levels, level).chunks:
+            cursor = db.execute(
+                "INSERT OR REPLACE INTO tiles (page_id, url, tx, ty, width, height) VALUES (?, ?, ?, ?, ?, ?)",
+                (page_id, chunk.url, chunk.tx, chunk.ty, chunk.width, chunk.height),
+            )
+            assert cursor.lastrowid is not None
+            tiles[chunk.url] = cursor.lastrowid
+        rows = [
+            (
+                page_id,
+                position,
+                self.term_id(normalize(word.text)),
+                word.text,
+                word.conf,
+                word.left,
+                word.top,
+                word.width,
+                word.height,
+                word.line,
+                tiles.get(word.tile, 0),
+            )
+            for position, word in enumerate(words)
+        ]
+        db.executemany("INSERT INTO words VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def commit(self):
+        self.db.commit()
+
+    def search(
+        self,
+        keyword: str,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        editions: list[str] | None = None,
+    ) -> list[Hit]:
+        """
+        Return every occurrence of `keyword` in the store.
+        Multi-word keywords match consecutive words on the same line.
+        """
+        terms = [normalize(t) for t in keyword.split()]
+        ids = [self.terms.get(t) for t in terms if t]
+        if not ids or None in ids:
+            return []
+        joins = "".join(
+            f" JOIN words w{i} ON w{i}.page_id = w0.page_id AND w{i}.position = w0.position + {i}"
+            f" AND w{i}.line = w0.line AND w{i}.term_id = ?"
+            for i in range(1, len(ids))
+        )
+        last = len(ids) - 1
+        query = (
+            "SELECT i.id, i.url, i.edition_name, i.published, p.key, p.pagenum, p.level, t.url,"
+            f" w0.position, w0.left, w0.top, w{last}.left + w{last}.width, MAX(w0.top + w0.height, w{last}.top + w{last}.height)"
+            f" FROM words w0{joins}"
+            " JOIN pages p ON p.id = w0.page_id"
+            " JOIN issues i ON i.id = p.issue_id"
+            " LEFT JOIN tiles t ON t.id = w0.tile_id"
+            " WHERE w0.term_id = ? AND i.site = ?"
+        )
+        params: list[object] = [*ids[1:], ids[0], self.site]
+        if start:
+            query += " AND i.published >= ?"
+            params.append(isoformat(start))
+        if end:
+            query += " AND i.published <= ?"
+            params.append(isoformat(end))
+        if editions:
+            query += f" AND i.edition_id IN ({', '.join('?' * len(editions))})"
+            params.extend(editions)
+        hits: list[Hit] = []
+        for row in self.db.execute(query, params).fetchall():
+            issue_id, url, edition, published, key, pagenum, level, tile, pos, *box = row
+            hits.append(
+                Hit(
+                    keyword=keyword,
+                    issue_id=issue_id,
+                    url=url,
+                    edition=edition,
+                    date=datetime.fromisoformat(published),
+                    page_key=key,
+                    pagenum=pagenum,
+                    level=level,
+                    text=self.line(key, issue_id, pos),
+                    tile=tile or "",
+                    box=tuple(box),
+                )
+            )
+        return hits
+
+    def line(self, page_key: str, issue_id: str, position: int) -> str:
+        """Return the text of the line containing the word at `position`."""
+        rows = self.db.execute(
+            "SELECT w.text FROM words w JOIN pages p ON p.id = w.page_id"
+            " WHERE p.issue_id = ? AND p.key = ? AND w.line = ("
+            "   SELECT line FROM words WHERE page_id = p.id AND position = ?"
+            " ) ORDER BY w.position",
+            (issue_id, page_key, position),
+        )
+        return " ".join(text for (text,) in rows)
+
+    async def evidence(
+        self, hit: Hit, *, client: ClientProto, margin: int = 40
+    ) -> Image.Image:
+        """Download the tiles around `hit` and return a crop of the matched text with `margin` pixels of context."""
+        from .ocr import PageChunk, PageLevel, stitch
+        from .preprocess import decode
+
+        rows = self.db.execute(
+            "SELECT t.tx, t.ty, t.width, t.height, t.url FROM tiles t JOIN pages p ON p.id = t.page_id"
+            " WHERE p.issue_id = ? AND p.key = ?",
+            (hit.issue_id, hit.page_key),
+        ).fetchall()
+        chunks = [
+            PageChunk(tx=tx, ty=ty, width=w, height=h, url=url)
+            for tx, ty, w, h, url in rows
+        ]
+        offsets = PageLevel(width=0, height=0, chunks=chunks).offsets()
+        left, top, right, bottom = hit.box
+        box = (left - margin, top - margin, right + margin, bottom + margin)
+        needed = [
+            c
+            for c in chunks
+            if offsets[c.tx, c.ty][0] < box[2]
+            and offsets[c.tx, c.ty][0] + c.width > box[0]
+            and offsets[c.tx, c.ty][1] < box[3]
+            and offsets[c.tx, c.ty][1] + c.height > box[1]
+        ]
+        if not needed:
+            return Image.new("L", (1, 1), 255)
+        tiles = [(c, decode((await client.get(c.url)).content)) for c in needed]
+        image = stitch(tiles, offsets)
+        x0 = min(offsets[c.tx, c.ty][0] for c in needed)
+        y0 = min(offsets[c.tx, c.ty][1] for c in needed)
+        return image.crop((box[0] - x0, box[1] - y0, box[2] - x0, box[3] - y0))
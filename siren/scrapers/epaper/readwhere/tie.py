@@ -1,8 +1,8 @@
 from yarl import URL
 from .core import BaseReadwhereScraper
-from .ocr import BaseReadwhereScraperOCR
+from .ocr import BaseReadwhereScraperOCR, BaseReadwhereScraperOCRIndex
 
-__all__ = ("TIEScraper", "TIEScraperOCR")
+__all__ = ("TIEScraper", "TIEScraperOCR", "TIEScraperOCRIndex")
 
 
 class TIE:
@@ -23,3 +23,6 @@ class TIEScraper(TIE, BaseReadwhereScraper): ...
 
 
 class TIEScraperOCR(TIE, BaseReadwhereScraperOCR): ...
+
+
+class TIEScraperOCRIndex(TIE, BaseReadwhereScraperOCRIndex): ...
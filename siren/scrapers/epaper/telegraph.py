@@ -1,12 +1,14 @@
 from __future__ import annotations
-from asyncio import Task
-import asyncio
+import json
 import re
+import sqlite3
+import zlib
 from datetime import timedelta, datetime
 import logging
-from siren.core import BaseScraper, Model
+from pathlib import Path
+from siren.core import BaseScraper, Model, Scheduler, cache_dir
 from yarl import URL
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 from bs4 import BeautifulSoup
 
 
@@ -24,23 +26,146 @@ EDITIONS = {"calcutta": 71, "north bengal": 72, "south bengal": 73}
 IMAGE_REGEX = re.compile(r"show_pop\('(\d+)','(\d+)','(\d+)'\)")
 
 
+class TextviewStore:
+    """
+    SQLite store of the Telegraph e-paper, so repeated runs and new keywords need no network access.
+
+    Textview HTML is kept zlib-compressed and keyed by (paper_id, article_id), and the article IDs
+    found on every (edition, date, page) are kept alongside the page count of that issue.
+    Textviews the server answered 404 for (e.g. the Bengal editions have none) are remembered too,
+    so they are not requested again.
+
+    Parameters
+    ----------
+
+    path: :class:`pathlib.Path`
+        The database file. It is created if it does not exist.
+
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS textviews (
+        paper_id TEXT NOT NULL,
+        article_id TEXT NOT NULL,
+        html BLOB NOT NULL,
+        PRIMARY KEY (paper_id, article_id)
+    );
+    CREATE TABLE IF NOT EXISTS missing_textviews (
+        paper_id TEXT NOT NULL,
+        article_id TEXT NOT NULL,
+        PRIMARY KEY (paper_id, article_id)
+    );
+    CREATE TABLE IF NOT EXISTS pages (
+        edition_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        page INTEGER NOT NULL,
+        pages INTEGER NOT NULL,
+        articles TEXT NOT NULL,
+        PRIMARY KEY (edition_id, date, page)
+    );
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(self.SCHEMA)
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def textview(self, paper_id: str, article_id: str) -> str | None:
+        row = self.db.execute(
+            "SELECT html FROM textviews WHERE paper_id = ? AND article_id = ?",
+            (paper_id, article_id),
+        ).fetchone()
+        return zlib.decompress(row[0]).decode() if row else None
+
+    def add_textview(self, paper_id: str, article_id: str, html: str):
+        self.db.execute(
+            "INSERT OR REPLACE INTO textviews VALUES (?, ?, ?)",
+            (paper_id, article_id, zlib.compress(html.encode())),
+        )
+
+    def textview_missing(self, paper_id: str, article_id: str) -> bool:
+        return (
+            self.db.execute(
+                "SELECT 1 FROM missing_textviews WHERE paper_id = ? AND article_id = ?",
+                (paper_id, article_id),
+            ).fetchone()
+            is not None
+        )
+
+    def add_missing_textview(self, paper_id: str, article_id: str):
+        self.db.execute(
+            "INSERT OR REPLACE INTO missing_textviews VALUES (?, ?)",
+            (paper_id, article_id),
+        )
+
+    def page(
+        self, edition_id: int, date: datetime, page: int
+    ) -> tuple[int, list[tuple[str, str]]] | None:
+        """Return the page count and the (paper_id, article_id) pairs of a page, if it has been indexed."""
+        row = self.db.execute(
+            "SELECT pages, articles FROM pages WHERE edition_id = ? AND date = ? AND page = ?",
+            (edition_id, date.strftime("%Y-%m-%d"), page),
+        ).fetchone()
+        if not row:
+            return None
+        return row[0], [tuple(ids) for ids in json.loads(row[1])]
+
+    def add_page(
+        self,
+        edition_id: int,
+        date: datetime,
+        page: int,
+        pages: int,
+        articles: list[tuple[str, str]],
+    ):
+        self.db.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+            (edition_id, date.strftime("%Y-%m-%d"), page, pages, json.dumps(articles)),
+        )
+
+
 class TGPaper:
-    def __init__(self, edition: str, edition_id: int, date: datetime, *, http: HTTP):
+    def __init__(
+        self,
+        edition: str,
+        edition_id: int,
+        date: datetime,
+        *,
+        http: HTTP,
+        store: TextviewStore,
+    ):
         self.edition = edition
         self.edition_id = edition_id
         self.date = date
         self.http = http
+        self.store = store
 
-    async def scrape(self, page: int = 1):
-        url = str(
+    def page_url(self, page: int = 1) -> str:
+        return str(
             BASE_URL
             / self.edition
             / self.date.strftime("%Y-%m-%d")
             / str(self.edition_id)
             / f"Page-{page}.html"
         )
-        resp = await self.http.get(url)
-        tasks: list[Task[TGArticle]] = []
+
+    def textview_url(self, paper_id: str, article_id: str) -> str:
+        return str(
+            BASE_URL / "textview" / paper_id / article_id / f"{self.edition_id}.html"
+        )
+
+    async def index(self, page: int = 1) -> tuple[int, list[tuple[str, str]]]:
+        """Return the page count of this issue and the (paper_id, article_id) pairs on `page`."""
+        if cached := self.store.page(self.edition_id, self.date, page):
+            return cached
+        resp = await self.http.get(self.page_url(page))
         html = resp.text
         soup = BeautifulSoup(html, "html.parser")
         pages = 0
@@ -48,44 +173,42 @@ class TGPaper:
             if _value := _element.get("value"):
                 assert isinstance(_value, str)
                 pages = int(_value)
-        for match in IMAGE_REGEX.finditer(html):
-            paper_id, article_id, _ = match.groups()
-            textview_url = str(
-                BASE_URL
-                / "textview"
-                / paper_id
-                / article_id
-                / f"{self.edition_id}.html"
-            )
-            task = asyncio.create_task(
-                TGArticle.from_textview(
-                    textview_url, page=page, page_url=url, paper=self, pages=pages
-                )
-            )
-            tasks.append(task)
-        return await asyncio.gather(*tasks)
-
-    async def search(self, keywords: list[str]):
-        initial = await self.scrape()
-        pages = initial[0].pages
-        tasks: list[Task[list[TGArticle]]] = []
-        for i in range(2, pages + 1):
-            task = asyncio.create_task(self.scrape(i))
-            tasks.append(task)
         articles = [
-            *initial,
-            *[a for chunk in await asyncio.gather(*tasks) for a in chunk],
+            (paper_id, article_id)
+            for paper_id, article_id, _ in IMAGE_REGEX.findall(html)
         ]
+        if articles:
+            self.store.add_page(self.edition_id, self.date, page, pages, articles)
+            # also saves the textviews fetched so far, in case the run is killed
+            self.store.commit()
+        return pages, articles
 
-        def has_keyword(article: TGArticle) -> bool:
-            for keyword in keywords:
-                if (article.title and keyword in article.title.lower()) or (
-                    keyword in article.body.lower()
-                ):
-                    return True
-            return False
-
-        return list(filter(has_keyword, articles))
+    async def article(
+        self, paper_id: str, article_id: str, *, page: int, pages: int
+    ) -> TGArticle | None:
+        """
+        Return an article from the store, fetching its textview if it is not stored yet.
+        Only textviews the server returned are stored; `None` is returned for missing ones.
+        A 404 is remembered, while other errors are retried by the next run.
+        """
+        url = self.textview_url(paper_id, article_id)
+        html = self.store.textview(paper_id, article_id)
+        if html is None:
+            if self.store.textview_missing(paper_id, article_id):
+                return None
+            resp = await self.http.get(url)
+            if resp.status_code == 404:
+                logger.debug(f"No textview at {url}")
+                self.store.add_missing_textview(paper_id, article_id)
+                return None
+            if resp.status_code != 200:
+                logger.warning(f"Could not fetch textview {url}: {resp.status_code}")
+                return None
+            html = resp.text
+            self.store.add_textview(paper_id, article_id, html)
+        return TGArticle.from_html(
+            html, url=url, page=page, page_url=self.page_url(page), paper=self, pages=pages
+        )
 
 
 class TGArticle(Model):
@@ -99,15 +222,14 @@ class TGArticle(Model):
     pages: int
 
     @classmethod
-    async def from_textview(
-        cls, url: str, *, page: int, page_url: str, paper: TGPaper, pages: int
+    def from_html(
+        cls, html: str, *, url: str, page: int, page_url: str, paper: TGPaper, pages: int
     ):
         """
-        Constructs a `TGArticle` from a BeautifulSoup instance containing an textview page.
+        Constructs a `TGArticle` from the HTML of a textview page.
 
         """
-        resp = await paper.http.get(url)
-        soup = BeautifulSoup(resp.text, "html.parser")
+        soup = BeautifulSoup(html, "html.parser")
         _title = soup.select_one(".haedlinesstory > b:nth-child(1)")
         title = _title.text if _title else None
         body = "\n".join([t.text for t in soup.select(".storyview-div p")])
@@ -122,21 +244,63 @@ class TGArticle(Model):
             pages=pages,
         )
 
+    def has_keyword(self, keywords: list[str]) -> bool:
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if (self.title and keyword in self.title.lower()) or (
+                keyword in self.body.lower()
+            ):
+                return True
+        return False
+
     def __repr__(self) -> str:
         return f"<TGArticle title={self.title}, body={self.body}, page={self.page}, url={self.url}>"
 
 
 class TGScraper(BaseScraper[TGArticle]):
+    WORKLOAD = "cpu"
+
+    EDITIONS: ClassVar[dict[str, int]] = EDITIONS
+
+    CONCURRENCY: ClassVar[int] = 16
+    """The maximum number of page and textview requests in flight at once."""
+
+    def open_store(self) -> TextviewStore:
+        return TextviewStore(cache_dir("telegraph") / "epaper.sqlite3")
 
     async def scrape(self) -> list[TGArticle]:
-        tasks: list[Task[list[TGArticle]]] = []
-        TEMP_FIX = (
-            ("calcutta", 71),
-        )  # FIXME: text view is only available for calcutta for now
-        for ed_name, ed_id in TEMP_FIX:
+        store = self.open_store()
+        scheduler = Scheduler[list[TGArticle]](max_concurrency=self.CONCURRENCY)
+
+        async def search_article(
+            paper: TGPaper, paper_id: str, article_id: str, page: int, pages: int
+        ) -> list[TGArticle]:
+            article = await paper.article(paper_id, article_id, page=page, pages=pages)
+            return [article] if article and article.has_keyword(self.keywords) else []
+
+        async def search_page(paper: TGPaper, page: int) -> list[TGArticle]:
+            pages, articles = await paper.index(page)
+            if page == 1:  # queue the remaining pages ahead of this page's articles
+                for i in range(2, pages + 1):
+                    scheduler.submit(
+                        paper.edition, lambda i=i: search_page(paper, i)
+                    )
+            for paper_id, article_id in articles:
+                scheduler.submit(
+                    paper.edition,
+                    lambda paper_id=paper_id, article_id=article_id: search_article(
+                        paper, paper_id, article_id, page, pages
+                    ),
+                )
+            return []
+
+        for ed_name, ed_id in self.EDITIONS.items():
             cur = self.start
             while cur <= self.end:
-                paper = TGPaper(ed_name, ed_id, cur, http=self.http)
-                tasks.append(asyncio.create_task(paper.search(keywords=self.keywords)))
+                paper = TGPaper(ed_name, ed_id, cur, http=self.http, store=store)
+                scheduler.submit(ed_name, lambda paper=paper: search_page(paper, 1))
                 cur += timedelta(days=1)
-        return [a for chunk in await asyncio.gather(*tasks) for a in chunk]
+        try:
+            return [a async for chunk in scheduler.run() for a in chunk]
+        finally:
+            store.close()
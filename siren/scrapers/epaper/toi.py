@@ -1,13 +1,18 @@
 import asyncio
 import json
 import csv
+import hashlib
+import math
+import os
 from io import StringIO
 from datetime import datetime
 from json import JSONDecodeError
+from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import Any, ClassVar
 import logging
 
-from siren.core import File, BaseScraper, Model
+from siren.core import File, BaseScraper, Model, Paginator, Pipeline, cache_dir
 
 import pydantic
 
@@ -123,6 +128,7 @@ class Search:
         end: datetime | None = None,
     ):
         self.client = client
+        self.requests = 0
         self.start = start or datetime.now()
         self.end = end or datetime.now()
 
@@ -150,10 +156,13 @@ class Search:
     def _fmt_dt(dt: datetime) -> str:
         return dt.strftime("%Y-%m-%d")
 
-    async def get_page(self, page_no: int = 1):
+    async def get_page(self, page_no: int = 1, limit: int | None = None):
         """Return a `SearchResult` for a single page."""
         copy = dict(page=page_no)
         copy.update(self.data)
+        if limit:
+            copy["limit"] = limit
+        self.requests += 1
         headers = {
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
             "Accept": "application/json, text/plain, */*",
@@ -181,47 +190,189 @@ class Search:
                 f"Ignoring exception {e} \n Response: {resp.status_code} {resp.text}"
             )
 
-    async def get_all(self) -> list[Article]:
-        """Calculate total pages and return a list of the obtained `Article`"""
-        initial = await self.get_page()
-        if not initial:
+    async def probe(self, sizes: tuple[int, ...]) -> SearchResult | None:
+        """
+        Find the largest page size in `sizes` that the server accepts, set it as this search's limit and return the first page.
+        If the server silently caps the page size, the cap is used instead. A size answered with an empty page
+        even though there are results counts as rejected. If every size is rejected, the default limit is used.
+        """
+        for size in sorted(sizes, reverse=True):
+            first = await self.get_page(limit=size)
+            if not first or (first.totalDocs > 0 and not first.data):
+                continue
+            if len(first.data) < min(size, first.totalDocs):
+                size = len(first.data)
+            self.data["limit"] = size
+            return first
+        logger.warning(f"No page size in {sizes} was accepted for {self!r}")
+        return await self.get_page()
+
+    async def stream(
+        self, *, sizes: tuple[int, ...] = (), lookahead: int = 4
+    ) -> AsyncIterator[Article]:
+        """
+        Yield every `Article` of this search as pages arrive.
+
+        The page size is probed from `sizes` if given, and at most `lookahead` pages are requested at once.
+        No request is made past the last page.
+        """
+        first = await (self.probe(sizes) if sizes else self.get_page())
+        if not first:
             logger.error(f"Could not find any articles for {self}!")
-            return []
-        pages = (initial.totalDocs // self.data["limit"]) + 2
-        tasks: list[asyncio.Task[SearchResult | None]] = []
-        for i in range(2, pages + 1):
-            coro = self.get_page(page_no=i)
-            task = asyncio.create_task(coro)
-            tasks.append(task)
-        data = [initial, *await asyncio.gather(*tasks)]
-        articles = [article for sr in data for article in getattr(sr, "data", [])]
-        if len(articles) != initial.totalDocs:
+            return
+        limit = self.data["limit"]
+        pages = max(1, math.ceil(first.totalDocs / limit))
+
+        async def fetch(page_no: int) -> SearchResult | None:
+            return first if page_no == 1 else await self.get_page(page_no)
+
+        paginator = Paginator(fetch, lookahead=lookahead, last=lambda _: pages)
+        count = 0
+        async for sr in paginator:
+            count += len(sr.data)
+            for article in sr.data:
+                yield article
+        if count != first.totalDocs:
             logger.error(
-                f"Obtained only {len(articles)}/{initial.totalDocs} articles for {repr(self)}!"
+                f"Obtained only {count}/{first.totalDocs} articles for {repr(self)}!"
             )
-        return articles
+        logger.info(
+            f"Obtained {count} articles in {self.requests} requests for {repr(self)}"
+        )
+
+    async def get_all(self) -> list[Article]:
+        """Return a list of every `Article` of this search."""
+        return [article async for article in self.stream()]
 
     def __repr__(self):
         return f"<Search({self.data['fromDate']} to {self.data['toDate']})>"
 
 
+class PageArchive:
+    """
+    Content-addressed on-disk archive of the page images of TOI articles.
+
+    Images are stored as `objects/<sha256[:2]>/<sha256>.jpg` under `root`, so identical pages are kept once.
+    `manifest.jsonl` records, for every image URL, the hash of its content and the IDs of the articles printed on it.
+    URLs already in the manifest are never downloaded again, so an interrupted run can simply be repeated.
+
+    Parameters
+    ----------
+
+    root: :class:`pathlib.Path`
+        The directory to keep the archive in.
+
+    client: :class:`ClientProto`
+        The HTTP Client to use.
+
+    """
+
+    def __init__(self, root: Path, *, client: ClientProto):
+        self.root = root
+        self.client = client
+        self.manifest = root / "manifest.jsonl"
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.manifest.exists():
+            for line in self.manifest.read_text().splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry["url"]] = entry
+
+    def path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.jpg"
+
+    def record(self, entry: dict[str, Any]):
+        self.entries[entry["url"]] = entry
+        with self.manifest.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    async def download(self, url: str) -> tuple[str, str] | None:
+        try:
+            resp = await self.client.get(url)
+        except Exception as e:
+            logger.error(f"Ignoring exception while archiving {url}: {e}")
+            return None
+        if resp.status_code != 200:
+            logger.error(f"Could not archive {url}: {resp.status_code}")
+            return None
+        data = resp.content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        return url, digest
+
+    async def archive(self, articles: list[Article], *, concurrency: int = 8):
+        """Download every distinct page image of `articles` that is not archived yet and record which articles are on it."""
+        pages: dict[str, set[str]] = {}
+        for article in articles:
+            try:
+                pages.setdefault(article.image, set()).add(article.article_id)
+            except ValueError:
+                continue
+        todo: list[str] = []
+        for url, ids in pages.items():
+            entry = self.entries.get(url)
+            if not entry or not self.path(entry["sha256"]).exists():
+                todo.append(url)
+            elif not ids <= set(entry["articles"]):
+                self.record({**entry, "articles": sorted(ids | set(entry["articles"]))})
+        logger.info(
+            f"Archiving {len(todo)} of {len(pages)} distinct page images for {len(articles)} articles"
+        )
+        pipeline = Pipeline(todo).stage(self.download, workers=concurrency)
+        async for url, digest in pipeline:
+            known = self.entries.get(url, {}).get("articles", [])
+            self.record(
+                {"url": url, "sha256": digest, "articles": sorted(pages[url] | set(known))}
+            )
+
+
 class TOIScraper(BaseScraper[Article]):
+    PAGE_SIZES: ClassVar[tuple[int, ...]] = (500, 200, 100, 50)
+    """Page sizes to probe the search API with, largest first."""
+
+    LOOKAHEAD: ClassVar[int] = 4
+    """The number of result pages requested ahead of the one being read, per keyword."""
+
+    ARCHIVE_PAGES: ClassVar[bool] = False
+    """Whether to download the page images of the results into a :class:`PageArchive`."""
+
+    ARCHIVE_CONCURRENCY: ClassVar[int] = 8
+    """The number of page images downloaded at once when archiving."""
+
+    async def search(self, term: str) -> AsyncIterator[Article]:
+        exclude = ["bomb"]
+        search = Search(
+            client=self.http,
+            include_any=[term],
+            exclude_all=exclude,
+            start=self.start,
+            end=self.end,
+            limit=50,
+        )
+        async for article in search.stream(
+            sizes=self.PAGE_SIZES, lookahead=self.LOOKAHEAD
+        ):
+            yield article
+
     async def scrape(self):
+        async def collect(term: str) -> list[Article]:
+            return [article async for article in self.search(term)]
+
         tasks: list[asyncio.Task[list[Article]]] = []
         for term in self.keywords:
-            exclude = ["bomb"]
-            search = Search(
-                client=self.http,
-                include_any=[term],
-                exclude_all=exclude,
-                start=self.start,
-                end=self.end,
-                limit=50,
-            )
-            task = asyncio.create_task(search.get_all())
+            task = asyncio.create_task(collect(term))
             tasks.append(task)
         chunks = await asyncio.gather(*tasks)
-        return [article for chunk in chunks for article in chunk]
+        articles = [article for chunk in chunks for article in chunk]
+        if self.ARCHIVE_PAGES:
+            archive = PageArchive(cache_dir("toi", "pages"), client=self.http)
+            await archive.archive(articles, concurrency=self.ARCHIVE_CONCURRENCY)
+        return articles
 
     async def _to_file(self):
         data = await self.scrape()
@@ -243,8 +394,8 @@ class TOIScraper(BaseScraper[Article]):
         f.seek(0)
 
         fmt = "%d-%m-%Y"
-        return File(
-            f.read().encode(),
+        return File.from_text(
+            f,
             f"TOI_{self.start.strftime(fmt)}_{self.end.strftime(fmt)}.csv",
             origin=self,
         )
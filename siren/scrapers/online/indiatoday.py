@@ -1,14 +1,20 @@
 import asyncio
+import math
+from collections.abc import AsyncIterator
 from datetime import datetime
+from logging import getLogger
 from typing import ClassVar
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pydantic
 from yarl import URL
-from siren.core import BaseScraper, Model
+from siren.core import BaseScraper, Model, Paginator, Pipeline
 from siren.core.http import HTTP
 
 __all__ = ("IndiaTodayOnlineScraper",)
 BASE_URL = URL("https://www.indiatoday.in/")
+STORY = SoupStrainer("div", class_="Story_description__fq_4S")
+
+logger = getLogger(__name__)
 
 
 class AuthorItem(Model):
@@ -106,9 +112,9 @@ class IndiaTodayArticle(Model):
     ):
         url = BASE_URL / content_item.canonical_url[1:]
         resp = await http.get(str(url))
-        soup = BeautifulSoup(resp.content, "html.parser")
+        soup = BeautifulSoup(resp.content, "html.parser", parse_only=STORY)
         text: list[str] = []
-        if story := soup.select_one("div.Story_description__fq_4S:nth-child(1)"):
+        if story := soup.find("div"):
             for p in story.find_all("p"):
                 text.append(p.text)
         return cls(content_item=content_item, body="\n".join(text), keyword=keyword)
@@ -120,8 +126,13 @@ class IndiaTodaySearchFail(Model):
 
 
 class IndiaTodayOnlineScraper(BaseScraper[IndiaTodayArticle]):
+    LOOKAHEAD: ClassVar[int] = 2
+    """The number of search pages requested ahead of the one being read."""
+
+    BODY_WORKERS: ClassVar[int] = 8
+    """The number of article bodies fetched at once per keyword."""
 
-    def get_url(self, keyword: str) -> URL:
+    def get_url(self, keyword: str, page: int = 0) -> URL:
         fmt = "%Y-%m-%d"
         return (
             BASE_URL
@@ -132,26 +143,65 @@ class IndiaTodayOnlineScraper(BaseScraper[IndiaTodayArticle]):
                 "ctype": "all,story,video,photo_gallery,audio,visualstory",
                 "datestart": self.start.strftime(fmt),
                 "dateend": self.end.strftime(fmt),
+                "page": page,
             }
         )
 
-    async def search(self, keyword: str) -> list[IndiaTodayArticle]:
-        url = str(self.get_url(keyword))
-        resp = await self.http.get(url)
+    async def search_page(self, keyword: str, page: int = 0) -> IndiaTodaySearch | None:
+        resp = await self.http.get(str(self.get_url(keyword, page)))
         try:
-            search = IndiaTodaySearch(**resp.json())
+            return IndiaTodaySearch(**resp.json())
         except pydantic.ValidationError:
-            return []
+            return None
+
+    @staticmethod
+    def last_page(search: IndiaTodaySearch) -> int:
+        data = search.data
+        pages = math.ceil(data.total_record / max(1, data.content_count_fetched))
+        if data.pagination_cap:
+            pages = min(pages, data.pagination_cap)
+        return max(0, pages - 1)
+
+    async def search_all(self, keyword: str) -> AsyncIterator[ContentItem]:
+        """Yield every search result for `keyword`, page by page."""
+
+        async def fetch(page: int) -> IndiaTodaySearch | None:
+            return await self.search_page(keyword, page)
+
+        paginator = Paginator(
+            fetch,
+            first=0,
+            lookahead=self.LOOKAHEAD,
+            last=self.last_page,
+            stop=lambda search: not search.data.is_load_more or not search.data.content,
+        )
+        seen: set[str] = set()
+        total = 0
+        async for search in paginator:
+            total = search.data.total_record
+            for content in search.data.content:
+                if content.canonical_url not in seen:
+                    seen.add(content.canonical_url)
+                    yield content
+        if len(seen) < total:
+            logger.warning(
+                f"Obtained only {len(seen)}/{total} results for {keyword} in {paginator.requests} pages"
+            )
 
-        tasks: list[asyncio.Task[IndiaTodayArticle]] = []
-        for content in search.data.content:
-            task = asyncio.create_task(
-                IndiaTodayArticle.from_content_item(
+    async def search(self, keyword: str) -> list[IndiaTodayArticle]:
+        async def fetch_body(content: ContentItem) -> IndiaTodayArticle | None:
+            try:
+                return await IndiaTodayArticle.from_content_item(
                     content, http=self.http, keyword=keyword
                 )
-            )
-            tasks.append(task)
-        return await asyncio.gather(*tasks)
+            except Exception as e:
+                logger.error(f"Ignoring exception {e}")
+                return None
+
+        pipeline = Pipeline(self.search_all(keyword)).stage(
+            fetch_body, workers=self.BODY_WORKERS
+        )
+        return [article async for article in pipeline]
 
     async def scrape(self) -> list[IndiaTodayArticle]:
         tasks: list[asyncio.Task[list[IndiaTodayArticle]]] = []
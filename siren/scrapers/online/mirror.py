@@ -2,22 +2,29 @@ from asyncio import Task
 import asyncio
 from datetime import datetime
 import json
+import re
 
 from io import StringIO
+from typing import Any, ClassVar
 from pydantic import ValidationError
-from siren.core import Model, BaseScraper
+from siren.core import Model, BaseScraper, Paginator
 from siren.utils import to_thread
 from yarl import URL
 from bs4 import BeautifulSoup, Tag
 from logging import getLogger
+from .sitemap import BaseSitemapScraper, SitemapEntry
 
 
 logger = getLogger(__name__)
 
+ARTICLE_ID = re.compile(r"/articleshow/(\d+)")
+
 __all__ = (
     "MumbaiMirrorOnlineScraper",
     "BangaloreMirrorOnlineScraper",
     "PuneMirrorOnlineScraper",
+    "MumbaiMirrorSitemapScraper",
+    "BangaloreMirrorSitemapScraper",
 )
 
 
@@ -42,8 +49,48 @@ class MirrorOnlineArticle(Model):
 class BaseMirrorOnlineScraper[T: MirrorOnlineArticle](BaseScraper[T]):
     BASE_URL: URL
     model: type[T]
+    WORKLOAD = "cpu"
+
+    LOOKAHEAD: ClassVar[int] = 2
+    """The number of search pages requested ahead of the one being read."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.seen: set[str] = set()
+        self.old: set[str] = set()
+        self.before_id: int | None = None
+        self.after_id: int | None = None
+
+    @staticmethod
+    def article_id(url: str) -> int | None:
+        """Return the numeric ID of an article URL. IDs are assigned in publishing order."""
+        return int(match[1]) if (match := ARTICLE_ID.search(url)) else None
+
+    def before_start(self, url: str) -> bool:
+        """Whether the article at `url` is known to be published before the window, by its date or its ID."""
+        id = self.article_id(url)
+        return url in self.old or (
+            id is not None and self.before_id is not None and id <= self.before_id
+        )
 
-    async def get_search_page(self, query: str, pagenumber: int = 0) -> list[T]:
+    def after_end(self, url: str) -> bool:
+        id = self.article_id(url)
+        return id is not None and self.after_id is not None and id >= self.after_id
+
+    def bound(self, url: str, article: MirrorOnlineArticle):
+        """Narrow the IDs known to lie outside the window with a fetched article."""
+        if (id := self.article_id(url)) is None:
+            if article.datePublished < self.start:
+                self.old.add(url)
+            return
+        if article.datePublished < self.start:
+            self.old.add(url)
+            self.before_id = max(id, self.before_id or id)
+        elif article.datePublished > self.end:
+            self.after_id = min(id, self.after_id or id)
+
+    async def get_search_urls(self, query: str, pagenumber: int = 0) -> list[str] | None:
+        """Return the article URLs on a search page, or `None` if the page does not exist."""
         url = str(
             self.BASE_URL
             / "getsearchdata.cms"
@@ -51,15 +98,60 @@ class BaseMirrorOnlineScraper[T: MirrorOnlineArticle](BaseScraper[T]):
         )
         resp = await self.http.get(url)
         if resp.status_code != 200:
-            return []
-        tasks: list[Task[T | None]] = []
-        for url in await self.parse_search_page(resp.text):
-            tasks.append(asyncio.create_task(self.get_article(url)))
-        return [
-            article
-            for article in await asyncio.gather(*tasks)
-            if article and self.start < article.datePublished < self.end
-        ]
+            return None
+        return await self.parse_search_page(resp.text)
+
+    async def get_articles(self, urls: list[str]) -> list[T]:
+        """
+        Fetch the articles at `urls` not fetched before by this scraper and return those within its window.
+        Articles whose IDs show they were published outside the window are not fetched.
+        """
+        tasks: dict[str, Task[T | None]] = {}
+        for url in urls:
+            if url in self.seen or self.before_start(url) or self.after_end(url):
+                continue
+            self.seen.add(url)
+            tasks[url] = asyncio.create_task(self.get_article(url))
+        articles: list[T] = []
+        for url, article in zip(tasks, await asyncio.gather(*tasks.values())):
+            if not article:
+                continue
+            self.bound(url, article)
+            if self.start < article.datePublished < self.end:
+                articles.append(article)
+        return articles
+
+    async def get_search_page(self, query: str, pagenumber: int = 0) -> list[T]:
+        return await self.get_articles(
+            await self.get_search_urls(query, pagenumber) or []
+        )
+
+    async def search(self, keyword: str) -> list[T]:
+        """
+        Read search pages (newest first) from page 0 until one is missing, empty, lists nothing new,
+        or only lists articles published before the window.
+        """
+        listed: set[str] = set()
+
+        def exhausted(urls: list[str]) -> bool:
+            # evaluated after the page's articles were fetched, so their dates are known
+            new = set(urls) - listed
+            listed.update(urls)
+            return not new or all(self.before_start(url) for url in urls)
+
+        async def fetch(page: int) -> list[str] | None:
+            return await self.get_search_urls(keyword, page)
+
+        paginator = Paginator(
+            fetch, first=0, lookahead=self.LOOKAHEAD, stop=exhausted
+        )
+        articles: list[T] = []
+        async for urls in paginator:
+            articles.extend(await self.get_articles(urls))
+        logger.info(
+            f"Read {paginator.requests} search pages with {len(listed)} results for {keyword}"
+        )
+        return articles
 
     @to_thread
     def parse_search_page(self, html: str) -> list[str]:
@@ -101,8 +193,7 @@ class BaseMirrorOnlineScraper[T: MirrorOnlineArticle](BaseScraper[T]):
     async def scrape(self) -> list[T]:
         tasks: list[Task[list[T]]] = []
         for keyword in self.keywords:
-            for i in range(10, 50):
-                tasks.append(asyncio.create_task(self.get_search_page(keyword, i)))
+            tasks.append(asyncio.create_task(self.search(keyword)))
         return list(
             set(article for chunk in await asyncio.gather(*tasks) for article in chunk)
         )
@@ -118,6 +209,49 @@ class BangaloreMirrorOnlineScraper(BaseMirrorOnlineScraper[MirrorOnlineArticle])
     model = MirrorOnlineArticle
 
 
+class BaseMirrorSitemapScraper[T: MirrorOnlineArticle](
+    BaseSitemapScraper[T], BaseMirrorOnlineScraper[T]
+):
+    """Discovers Mirror articles through the per-day static sitemaps instead of `getsearchdata.cms`."""
+
+    SITEMAP_NAME: ClassVar[str]
+
+    def sitemap_urls(self) -> list[str]:
+        return [
+            str(
+                self.BASE_URL
+                / "staticsitemap"
+                / self.SITEMAP_NAME
+                / f"{day.year}-{day:%B}-{day.day}.xml"
+            )
+            for day in self.days()
+        ]
+
+    async def fetch_article(self, entry: SitemapEntry) -> T | None:
+        resp = await self.http.get(entry.loc)
+        if resp.status_code != 200:
+            return None
+        return await self.parse_article(resp.text, entry.loc)
+
+    def article_text(self, article: T) -> str:
+        return f"{article.headline}\n{article.description}"
+
+    def article_date(self, article: T) -> datetime | None:
+        return article.datePublished
+
+
+class MumbaiMirrorSitemapScraper(BaseMirrorSitemapScraper[MirrorOnlineArticle]):
+    BASE_URL = URL("https://mumbaimirror.indiatimes.com")
+    SITEMAP_NAME = "mumbaimirror"
+    model = MirrorOnlineArticle
+
+
+class BangaloreMirrorSitemapScraper(BaseMirrorSitemapScraper[MirrorOnlineArticle]):
+    BASE_URL = URL("https://bangaloremirror.indiatimes.com")
+    SITEMAP_NAME = "bangaloremirror"
+    model = MirrorOnlineArticle
+
+
 """
 
 Pune Mirror Scraper
@@ -1,9 +1,11 @@
 from yarl import URL
 import asyncio
+import math
 from io import StringIO
 from logging import getLogger
 from datetime import datetime
-from siren.core import BaseScraper, Model
+from typing import ClassVar
+from siren.core import BaseScraper, Model, Paginator
 
 from pydantic import Field
 
@@ -22,7 +24,7 @@ class Card(Model):
 
 class NMArticle(Model):
     url: str
-    author_name: str = Field(alias="author-name")
+    author_name: str | None = Field(alias="author-name", default=None)
     headline: str
     subheadline: str | None = None
     published_at: datetime = Field(alias="published-at")
@@ -45,6 +47,9 @@ class NMScraper(BaseScraper[NMArticle]):
 
     PAGE_SIZE = 100
 
+    LOOKAHEAD: ClassVar[int] = 2
+    """The number of result pages requested ahead of the one being read."""
+
     def build_url(
         self,
         *,
@@ -53,7 +58,6 @@ class NMScraper(BaseScraper[NMArticle]):
         offset: int,
         fields: list[str] = [
             "url",
-            "author-name",
             "headline",
             "subheadline",
             "published-at",
@@ -65,6 +69,9 @@ class NMScraper(BaseScraper[NMArticle]):
             "limit": limit,
             "offset": offset,
             "fields": ",".join(fields),
+            "published-after": int(self.start.timestamp() * 1000),
+            "published-before": int(self.end.timestamp() * 1000),
+            "sort": "latest-published",
         }
 
     async def fetch(self, *, q: str, limit: int, offset: int) -> SearchResult:
@@ -76,23 +83,24 @@ class NMScraper(BaseScraper[NMArticle]):
         return SearchResult(**data)
 
     async def fetch_all(self, *, q: str) -> list[NMArticle]:
-        data: list[NMArticle] = []
-        initial = await self.fetch(q=q, limit=self.PAGE_SIZE, offset=0)
-        data.extend(
-            [a for a in initial.items if self.start < a.published_at < self.end]
-        )
-        pages = (initial.total // self.PAGE_SIZE) - 1
-        tasks: list[asyncio.Task[SearchResult]] = []
-        for i in range(1, pages - 1):
-            task = asyncio.create_task(
-                self.fetch(q=q, limit=self.PAGE_SIZE, offset=self.PAGE_SIZE * i)
+        """Fetch every page of results for `q` within the scraper's window."""
+
+        async def fetch(page: int) -> SearchResult:
+            return await self.fetch(
+                q=q, limit=self.PAGE_SIZE, offset=self.PAGE_SIZE * page
             )
-            tasks.append(task)
 
-        for fut in asyncio.as_completed(tasks):
-            sr = await fut
+        paginator = Paginator(
+            fetch,
+            first=0,
+            lookahead=self.LOOKAHEAD,
+            last=lambda initial: max(0, math.ceil(initial.total / self.PAGE_SIZE) - 1),
+            stop=lambda sr: len(sr.items) < self.PAGE_SIZE,
+        )
+        data: list[NMArticle] = []
+        async for sr in paginator:
             data.extend([a for a in sr.items if self.start < a.published_at < self.end])
-
+        logger.info(f"Fetched {paginator.requests} pages for {q}")
         return data
 
     async def scrape(self) -> list[NMArticle]:
@@ -2,14 +2,16 @@ from asyncio import Task
 import asyncio
 from datetime import datetime
 import re
+from typing import ClassVar
 from bs4 import BeautifulSoup, Tag
 from yarl import URL
-from siren.core import Model, BaseScraper
+from siren.core import Model, BaseScraper, Paginator
 from siren.core.http import HTTP
 import logging
+from .sitemap import BaseSitemapScraper, SitemapEntry
 
 logger = logging.getLogger(__name__)
-__all__ = ("TelegraphOnlineScraper",)
+__all__ = ("TelegraphOnlineScraper", "TelegraphSitemapScraper")
 
 BASE_URL = URL("https://www.telegraphindia.com/")
 HEADERS = {
@@ -29,17 +31,57 @@ HEADERS = {
     "Priority": "u=0, i",
     "TE": "trailers",
 }
+DATE_HINTS = (
+    (re.compile(r"\b(\d{2}\.\d{2}\.\d{2})\b"), "%d.%m.%y"),
+    (re.compile(r"\b(\d{1,2} [A-Z][a-z]{2} \d{4})\b"), "%d %b %Y"),
+    (re.compile(r"\b([A-Z][a-z]{2} \d{1,2}, \d{4})\b"), "%b %d, %Y"),
+)
+
+
+def date_hint(text: str) -> datetime | None:
+    """Return the first date found in a search listing entry, if any."""
+    for regex, fmt in DATE_HINTS:
+        if match := regex.search(text):
+            try:
+                return datetime.strptime(match.group(1), fmt)
+            except ValueError:
+                continue
+    return None
 
 
 class TGOnlineSearchPage(Model):
     total: int
     article_urls: list[str]
+    dates: list[datetime | None] = []
+    """The date shown next to each entry of `article_urls` in the listing, if any."""
+
+    def candidates(self, start: datetime, end: datetime) -> list[str]:
+        """Return the article URLs whose listing date is within `start` and `end`, or unknown."""
+        return [
+            url
+            for url, date in zip(self.article_urls, self.dates or [None] * len(self.article_urls))
+            if date is None or start.date() <= date.date() <= end.date()
+        ]
+
+    def before(self, start: datetime) -> bool:
+        """Whether every entry of this page is dated before `start`. Pages without dates never are."""
+        return bool(self.dates) and all(
+            date is not None and date.date() < start.date() for date in self.dates
+        )
 
     async def filter(
-        self, start: datetime, end: datetime, *, http: HTTP
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        http: HTTP,
+        exclude: set[str] = set(),
     ) -> list["TelegraphOnlineArticle"]:
+        """Fetch the candidate articles of this page, skipping URLs in `exclude`, and return those within `start` and `end`."""
         tasks: list[Task[TelegraphOnlineArticle]] = []
-        for url in self.article_urls:
+        for url in self.candidates(start, end):
+            if url in exclude:
+                continue
             task = asyncio.create_task(TelegraphOnlineArticle.from_url(url, http=http))
             tasks.append(task)
         articles: list[TelegraphOnlineArticle] = []
@@ -48,7 +90,7 @@ class TGOnlineSearchPage(Model):
             if article.date and start < article.date < end:
                 articles.append(article)
         logger.info(
-            f"Filtered {len(articles)} articles from {len(self.article_urls)} articles!"
+            f"Filtered {len(articles)} articles from {len(tasks)}/{len(self.article_urls)} fetched articles!"
         )
         return articles
 
@@ -101,32 +143,45 @@ class TelegraphOnlineArticle(Model):
 
 
 class TelegraphOnlineScraper(BaseScraper[TelegraphOnlineArticle]):
+    WORKLOAD = "cpu"
+
+    PAGE_SIZE: ClassVar[int] = 20
+
+    LOOKAHEAD: ClassVar[int] = 2
+    """The number of search pages requested ahead of the one being read."""
 
     def get_url(self, keyword: str, page: int) -> URL:
         return (BASE_URL / "search") % {"search-term": keyword, "page": page}
 
     async def search_all(self, keyword: str) -> list[TelegraphOnlineArticle]:
-        PAGE_SIZE = 20
-        if initial := await self.search_page(keyword):
-            tasks: list[Task[TGOnlineSearchPage | None]] = []
-            pages = initial.total // PAGE_SIZE
-            logger.info(f"Found {pages} pages for {keyword}")
-            for page in range(1, pages + 1):
-                tasks.append(asyncio.create_task(self.search_page(keyword, page=page)))
-
-            articles: list[TelegraphOnlineArticle] = await initial.filter(
-                self.start, self.end, http=self.http
+        """
+        Search `keyword` page by page, newest first, and return the articles published within the scraper's window.
+
+        Only articles whose listing date falls in the window (or is missing) are fetched, and pagination stops
+        at the first page whose entries are all older than `start`.
+        """
+
+        async def fetch(page: int) -> TGOnlineSearchPage | None:
+            return await self.search_page(keyword, page=page)
+
+        paginator = Paginator(
+            fetch,
+            first=0,
+            lookahead=self.LOOKAHEAD,
+            last=lambda initial: initial.total // self.PAGE_SIZE,
+            stop=lambda page: page.before(self.start),
+        )
+        articles: list[TelegraphOnlineArticle] = []
+        seen: set[str] = set()
+        async for search_page in paginator:
+            articles.extend(
+                await search_page.filter(
+                    self.start, self.end, http=self.http, exclude=seen
+                )
             )
-            for fut in asyncio.as_completed(tasks):
-                search_page = await fut
-                if search_page:
-                    articles.extend(
-                        await search_page.filter(self.start, self.end, http=self.http)
-                    )
-            return articles
-        else:
-            articles: list[TelegraphOnlineArticle] = []
-            return articles
+            seen.update(search_page.article_urls)
+        logger.info(f"Searched {paginator.requests} pages for {keyword}")
+        return articles
 
     async def search_page(
         self, keyword: str, *, page: int = 0
@@ -137,13 +192,18 @@ class TelegraphOnlineScraper(BaseScraper[TelegraphOnlineArticle]):
         def parse():
             soup = BeautifulSoup(resp.content, "html.parser")
             article_urls: list[str] = []
+            dates: list[datetime | None] = []
             if results := soup.find("div", class_="searchresult"):
                 total = int(results.text.split()[-1])
                 if storylisting := soup.find("ul", class_="storylisting"):
                     for anchor in storylisting.select("li > a"):
                         href = anchor.get("href")[1:]
                         article_urls.append(href)
-                return TGOnlineSearchPage(total=total, article_urls=article_urls)
+                        item = anchor.find_parent("li")
+                        dates.append(date_hint(item.get_text(" ") if item else ""))
+                return TGOnlineSearchPage(
+                    total=total, article_urls=article_urls, dates=dates
+                )
             else:
                 return None
 
@@ -155,3 +215,21 @@ class TelegraphOnlineScraper(BaseScraper[TelegraphOnlineArticle]):
             task = asyncio.create_task(self.search_all(kw))
             tasks.append(task)
         return [article for chunk in await asyncio.gather(*tasks) for article in chunk]
+
+
+class TelegraphSitemapScraper(BaseSitemapScraper[TelegraphOnlineArticle]):
+    """Discovers Telegraph articles through the site's sitemap index instead of `/search`."""
+
+    SITEMAP_INDEX = str(BASE_URL / "sitemap.xml")
+    WORKLOAD = "cpu"
+
+    async def fetch_article(self, entry: SitemapEntry) -> TelegraphOnlineArticle:
+        return await TelegraphOnlineArticle.from_url(
+            entry.loc.removeprefix(str(BASE_URL)), http=self.http
+        )
+
+    def article_text(self, article: TelegraphOnlineArticle) -> str:
+        return f"{article.title}\n{article.header}\n{article.content}"
+
+    def article_date(self, article: TelegraphOnlineArticle) -> datetime | None:
+        return article.date
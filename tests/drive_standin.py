@@ -0,0 +1,250 @@
+"""
+A local stand-in for the Google Drive v3 API.
+
+:class:`DriveStandIn` answers the HTTP requests the Drive client library makes, so a real service object built
+with `googleapiclient.discovery.build("drive", "v3", http=DriveStandIn(), static_discovery=True)` runs against an
+in-memory Drive. It covers what :class:`siren.core.cloud.Drive` uses: paginated listing, folder creation (alone or
+in a batch request) and resumable uploads (creating and updating files), including the `bytes */<size>` status query
+a client sends to resume an interrupted upload.
+"""
+
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+from email import message_from_string
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+import httplib2
+
+__all__ = ("DriveStandIn", "StoredFile")
+
+ROOT_URL = "https://www.googleapis.com"
+UPLOAD_PREFIX = f"{ROOT_URL}/upload/drive/v3/files"
+BATCH_URL = f"{ROOT_URL}/batch/drive/v3"
+SESSION_PREFIX = "https://standin.invalid/upload/"
+
+
+@dataclass
+class StoredFile:
+    id: str
+    name: str
+    mimeType: str
+    parents: list[str]
+    content: bytes = b""
+
+    @property
+    def md5Checksum(self) -> str:
+        return hashlib.md5(self.content).hexdigest()
+
+    def resource(self) -> dict[str, Any]:
+        resource = {
+            "kind": "drive#file",
+            "id": self.id,
+            "name": self.name,
+            "mimeType": self.mimeType,
+            "parents": self.parents,
+        }
+        if self.mimeType != "application/vnd.google-apps.folder":
+            resource["md5Checksum"] = self.md5Checksum
+        return resource
+
+
+@dataclass
+class Session:
+    """A resumable upload in progress: the bytes the server has committed so far."""
+
+    file: StoredFile
+    size: int | None
+    received: bytearray = field(default_factory=bytearray)
+
+
+class DriveStandIn:
+    """
+    An `httplib2.Http` replacement that serves an in-memory Drive.
+
+    Parameters
+    ----------
+
+    drop: :class:`dict[int, int]`
+        Byte offsets at which upload connections break, with how many times each breaks.
+        A chunk covering such an offset has the bytes before it committed and then fails with
+        :class:`ConnectionError`, so the client has to ask the server where to resume.
+
+    page_size: :class:`int`
+        The most files a listing returns per page, whatever `pageSize` asks for (Drive may return fewer too).
+
+    forbidden: :class:`set[str]`
+        Names of files whose creation fails with a 403.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        drop: dict[int, int] | None = None,
+        page_size: int = 1000,
+        forbidden: set[str] | None = None,
+    ):
+        self.files: dict[str, StoredFile] = {}
+        self.sessions: dict[str, Session] = {}
+        self.drop = dict(drop or {})
+        self.page_size = page_size
+        self.forbidden = set(forbidden or ())
+        self.ids = (f"id{n}" for n in itertools.count(1))
+        self.session_ids = (f"s{n}" for n in itertools.count(1))
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        """Every `(method, uri, headers)` received, in order."""
+
+    def add(
+        self, name: str, parents: list[str], content: bytes = b"", mimeType: str = "text/csv"
+    ) -> StoredFile:
+        file = StoredFile(next(self.ids), name, mimeType, parents, content)
+        self.files[file.id] = file
+        return file
+
+    def named(self, name: str) -> list[StoredFile]:
+        return [f for f in self.files.values() if f.name == name]
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+        **_: Any,
+    ) -> tuple[httplib2.Response, bytes]:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.requests.append((method, uri, headers))
+        if hasattr(body, "read"):
+            body = body.read()
+        if isinstance(body, str):
+            body = body.encode()
+        return self.route(uri, method, body, headers)
+
+    def route(
+        self, uri: str, method: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[httplib2.Response, bytes]:
+        url = urlsplit(uri)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if uri.startswith(SESSION_PREFIX):
+            return self.put_chunk(url.path.rsplit("/", 1)[-1], body or b"", headers)
+        if uri.startswith(UPLOAD_PREFIX) and query.get("uploadType") == "resumable":
+            return self.start_upload(method, url.path, body, headers)
+        if method == "POST" and uri == BATCH_URL:
+            return self.batch((body or b"").decode(), headers)
+        if method == "GET" and url.path == "/drive/v3/files":
+            return self.list(
+                query.get("q", ""), int(query.get("pageSize", 100)), query.get("pageToken")
+            )
+        if method == "POST" and url.path == "/drive/v3/files":
+            metadata = json.loads(body or b"{}")
+            if metadata["name"] in self.forbidden:
+                return self.respond(403, {"error": {"code": 403, "message": "Forbidden"}})
+            file = self.add(metadata["name"], metadata.get("parents", []), mimeType=metadata["mimeType"])
+            return self.respond(200, file.resource())
+        return self.respond(404, {"error": {"code": 404, "message": f"{method} {url.path}"}})
+
+    @staticmethod
+    def respond(status: int, payload: Any = None, **headers: str) -> tuple[httplib2.Response, bytes]:
+        content = json.dumps(payload).encode() if payload is not None else b""
+        info = {"status": str(status), "content-type": "application/json"} | headers
+        return httplib2.Response(info), content
+
+    def list(self, q: str, page_size: int, token: str | None) -> tuple[httplib2.Response, bytes]:
+        parent = re.search(r"'([^']*)' in parents", q)
+        name = re.search(r"name = '((?:[^'\\]|\\.)*)'", q)
+        files = [
+            f.resource()
+            for f in self.files.values()
+            if (parent is None or parent[1] in f.parents)
+            and (name is None or f.name == re.sub(r"\\(.)", r"\1", name[1]))
+        ]
+        start = int(token or 0)
+        end = start + min(page_size, self.page_size)
+        page: dict[str, Any] = {"files": files[start:end]}
+        if end < len(files):
+            page["nextPageToken"] = str(end)
+        return self.respond(200, page)
+
+    def batch(self, body: str, headers: dict[str, str]) -> tuple[httplib2.Response, bytes]:
+        """Answer a `multipart/mixed` batch request, routing each of its parts as a request of its own."""
+        message = message_from_string(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        boundary = "standin_batch"
+        parts: list[str] = []
+        for part in message.get_payload():  # type: ignore
+            request_line, request = part.get_payload().split("\n", 1)
+            method, path, _ = request_line.split(" ", 2)
+            inner = message_from_string(request)
+            inner_headers = {k.lower(): v for k, v in inner.items()}
+            payload = inner.get_payload()
+            resp, content = self.route(
+                ROOT_URL + path, method, payload.encode() if payload else None, inner_headers
+            )
+            content_id = " ".join(part["Content-ID"].split())
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id[1:]}\r\n\r\n"
+                f"HTTP/1.1 {resp.status} {HTTPStatus(resp.status).phrase}\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{content.decode()}\r\n"
+            )
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        info = {"status": "200", "content-type": f"multipart/mixed; boundary={boundary}"}
+        return httplib2.Response(info), content.encode()
+
+    def start_upload(
+        self, method: str, path: str, body: Any, headers: dict[str, str]
+    ) -> tuple[httplib2.Response, bytes]:
+        size = headers.get("x-upload-content-length")
+        metadata = json.loads(body) if body else {}
+        if method == "POST":
+            file = StoredFile(
+                next(self.ids),
+                metadata["name"],
+                headers.get("x-upload-content-type", "application/octet-stream"),
+                metadata.get("parents", []),
+            )
+        elif (file := self.files.get(path.rsplit("/", 1)[-1])) is None:
+            return self.respond(404, {"error": {"code": 404, "message": "File not found"}})
+        session = next(self.session_ids)
+        self.sessions[session] = Session(file, int(size) if size else None)
+        return self.respond(200, location=SESSION_PREFIX + session)
+
+    def put_chunk(
+        self, session_id: str, data: bytes, headers: dict[str, str]
+    ) -> tuple[httplib2.Response, bytes]:
+        session = self.sessions[session_id]
+        content_range = headers.get("content-range", "")
+        if match := re.fullmatch(r"bytes \*/(\d+|\*)", content_range):
+            return self.progress(session)
+        match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", content_range)
+        if match is None:
+            return self.respond(400, {"error": {"code": 400, "message": "Bad Content-Range"}})
+        start = int(match[1])
+        if start != len(session.received):
+            return self.respond(400, {"error": {"code": 400, "message": "Chunk does not continue the upload"}})
+        for offset, times in self.drop.items():
+            if times > 0 and start <= offset < start + len(data):
+                self.drop[offset] -= 1
+                session.received += data[: offset - start]
+                raise ConnectionError(f"Connection broke at byte {offset}")
+        session.received += data
+        if match[3] != "*":
+            session.size = int(match[3])
+        if session.size is None or len(session.received) < session.size:
+            return self.progress(session)
+        file = session.file
+        file.content = bytes(session.received)
+        self.files[file.id] = file
+        del self.sessions[session_id]
+        return self.respond(200, {"id": file.id, "md5Checksum": file.md5Checksum})
+
+    def progress(self, session: Session) -> tuple[httplib2.Response, bytes]:
+        if not session.received:
+            return self.respond(308)
+        return self.respond(308, range=f"bytes=0-{len(session.received) - 1}")
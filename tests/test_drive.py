@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from typing import ClassVar
+from unittest import mock
+from googleapiclient.discovery import build
+from siren.core import File
+from siren.core.cloud import Drive
+from tests.drive_standin import DriveStandIn
+
+CHUNK = 256 * 1024
+
+
+class FakeScraper:
+    start = datetime(2024, 1, 1)
+    end = datetime(2024, 1, 2)
+
+
+class SmallChunkDrive(Drive):
+    CHUNK_SIZE: ClassVar[int] = CHUNK
+    MAX_RETRIES: ClassVar[int] = 2
+
+
+class DriveUploadTest(unittest.TestCase):
+    def setUp(self):
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        for patch in (
+            mock.patch.dict(os.environ, {"SIREN_CACHE_DIR": cache.name}),
+            mock.patch("siren.core.cloud.time.sleep"),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.data = os.urandom(3 * CHUNK + 1000)
+
+    def drive(self, standin: DriveStandIn) -> Drive:
+        service = build("drive", "v3", http=standin, static_discovery=True)
+        return SmallChunkDrive({}, "root", service=service)
+
+    def file(self, data: bytes) -> File:
+        return File(data, "2024-01-02.csv", origin=FakeScraper())  # type: ignore
+
+    def sent(self, standin: DriveStandIn) -> list[str]:
+        """The `Content-Range` of every chunk sent, including status queries."""
+        return [h["content-range"] for m, _, h in standin.requests if m == "PUT"]
+
+    def test_upload(self):
+        standin = DriveStandIn()
+        self.drive(standin).upload(self.file(self.data))
+        [folder] = standin.named("FakeScraper")
+        [stored] = standin.named("2024-01-02.csv")
+        self.assertEqual(stored.parents, [folder.id])
+        self.assertEqual(stored.content, self.data)
+        self.assertEqual(len(self.sent(standin)), 4)
+
+    def test_upload_resumes_after_dropped_chunk(self):
+        broken_at = CHUNK + 1000
+        standin = DriveStandIn(drop={broken_at: 1})
+        self.drive(standin).upload(self.file(self.data))
+        [stored] = standin.named("2024-01-02.csv")
+        self.assertEqual(stored.content, self.data)
+        size = len(self.data)
+        # the same upload session carries on from the last byte the server committed
+        self.assertEqual(
+            self.sent(standin),
+            [
+                f"bytes 0-{CHUNK - 1}/{size}",
+                f"bytes {CHUNK}-{2 * CHUNK - 1}/{size}",
+                f"bytes */{size}",
+                f"bytes {broken_at}-{broken_at + CHUNK - 1}/{size}",
+                f"bytes {broken_at + CHUNK}-{broken_at + 2 * CHUNK - 1}/{size}",
+            ],
+        )
+
+    def test_upload_gives_up(self):
+        standin = DriveStandIn(drop={CHUNK: SmallChunkDrive.MAX_RETRIES + 1})
+        with self.assertRaises(ConnectionError):
+            self.drive(standin).upload(self.file(self.data))
+        self.assertEqual(standin.named("2024-01-02.csv"), [])
+
+    def test_unchanged_file_is_skipped(self):
+        standin = DriveStandIn()
+        drive = self.drive(standin)
+        drive.upload(self.file(self.data))
+        uploads = len(self.sent(standin))
+        drive.upload(self.file(self.data))
+        self.assertEqual(len(self.sent(standin)), uploads)
+        self.assertEqual(len(standin.named("2024-01-02.csv")), 1)
+
+    def test_changed_file_is_updated(self):
+        standin = DriveStandIn()
+        drive = self.drive(standin)
+        drive.upload(self.file(self.data))
+        [stored] = standin.named("2024-01-02.csv")
+        drive.upload(self.file(self.data[::-1]))
+        [updated] = standin.named("2024-01-02.csv")
+        self.assertEqual(updated.id, stored.id)
+        self.assertEqual(updated.content, self.data[::-1])
+
+
+class DriveFoldersTest(unittest.TestCase):
+    def setUp(self):
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        patch = mock.patch.dict(os.environ, {"SIREN_CACHE_DIR": cache.name})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def drive(self, standin: DriveStandIn) -> Drive:
+        service = build("drive", "v3", http=standin, static_discovery=True)
+        return Drive({}, "root", service=service)
+
+    def listings(self, standin: DriveStandIn) -> int:
+        return sum(m == "GET" for m, _, _ in standin.requests)
+
+    def test_refresh_index_reads_every_page(self):
+        standin = DriveStandIn(page_size=2)
+        folders = {
+            name: standin.add(name, ["root"], mimeType=Drive.FOLDER_MIMETYPE).id
+            for name in (f"Scraper{i}" for i in range(5))
+        }
+        standin.add("notes.txt", ["root"])
+        standin.add("Elsewhere", ["other"], mimeType=Drive.FOLDER_MIMETYPE)
+        drive = self.drive(standin)
+        drive.refresh_index()
+        self.assertEqual(drive.targets, folders)
+        self.assertEqual(len(drive.files), 6)
+        self.assertEqual(self.listings(standin), 3)
+        # the index is saved, so a new instance starts with it
+        self.assertEqual(self.drive(standin).targets, folders)
+
+    def test_create_folders_in_one_batch(self):
+        standin = DriveStandIn(page_size=1, forbidden={"Forbidden"})
+        existing = standin.add("Existing", ["root"], mimeType=Drive.FOLDER_MIMETYPE)
+        drive = self.drive(standin)
+        with self.assertLogs("siren.core.cloud", "ERROR") as logs:
+            drive.create_folders(["Existing", "A", "B", "Forbidden", "C"])
+        batches = [uri for m, uri, _ in standin.requests if m == "POST"]
+        self.assertEqual(batches, ["https://www.googleapis.com/batch/drive/v3"])
+        self.assertEqual(set(drive.targets), {"Existing", "A", "B", "C"})
+        self.assertEqual(drive.targets["Existing"], existing.id)
+        for name in ("A", "B", "C"):
+            [folder] = standin.named(name)
+            self.assertEqual(folder.parents, ["root"])
+            self.assertEqual(folder.mimeType, Drive.FOLDER_MIMETYPE)
+            self.assertEqual(drive.targets[name], folder.id)
+        self.assertEqual(standin.named("Forbidden"), [])
+        [message] = logs.output
+        self.assertIn("Forbidden", message)
+        # everything that exists is indexed, so creating them again makes no requests
+        requests = len(standin.requests)
+        drive.create_folders(["Existing", "A", "B", "C"])
+        self.assertEqual(len(standin.requests), requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from siren.core import Model
+from siren.scrapers.online.sitemap import BaseSitemapScraper, SitemapEntry, parse_sitemap
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sitemaps"
+BASE = "https://example.com/sitemaps/"
+
+
+class Response:
+    def __init__(self, status_code: int, content: bytes = b""):
+        self.status_code = status_code
+        self.content = content
+
+
+class FixtureHTTP:
+    """Serves the files in `FIXTURES` under `BASE`, recording every requested URL."""
+
+    def __init__(self):
+        self.requested: list[str] = []
+
+    async def get(self, url: str) -> Response:
+        self.requested.append(url)
+        path = FIXTURES / url.removeprefix(BASE)
+        if not url.startswith(BASE) or not path.is_file():
+            return Response(404)
+        return Response(200, path.read_bytes())
+
+
+class Article(Model):
+    url: str
+    text: str
+    date: datetime | None
+
+
+ARTICLES = {
+    "https://example.com/news/published-in-window": Article(
+        url="https://example.com/news/published-in-window",
+        text="Man found dead in his flat",
+        date=datetime(2024, 6, 10, 4, tzinfo=timezone.utc),
+    ),
+    # listed by its lastmod, but published long before the window
+    "https://example.com/news/edited-in-window": Article(
+        url="https://example.com/news/edited-in-window",
+        text="Found dead, updated with new details",
+        date=datetime(2024, 4, 1, tzinfo=timezone.utc),
+    ),
+    "https://example.com/news/undated": Article(
+        url="https://example.com/news/undated", text="Found dead", date=None
+    ),
+    "https://example.com/news/gzipped-in-window": Article(
+        url="https://example.com/news/gzipped-in-window",
+        text="Traffic update",
+        date=datetime(2024, 6, 11, 2, 30, tzinfo=timezone.utc),
+    ),
+}
+
+
+class FixtureSitemapScraper(BaseSitemapScraper[Article]):
+    SITEMAP_INDEX = BASE + "index.xml"
+
+    async def fetch_article(self, entry: SitemapEntry) -> Article | None:
+        return ARTICLES.get(entry.loc)
+
+    def article_text(self, article: Article) -> str:
+        return article.text
+
+    def article_date(self, article: Article) -> datetime | None:
+        return article.date
+
+
+def scraper(http: FixtureHTTP) -> FixtureSitemapScraper:
+    return FixtureSitemapScraper(
+        start=datetime(2024, 6, 10, tzinfo=timezone.utc),
+        end=datetime(2024, 6, 12, tzinfo=timezone.utc),
+        keywords=["found dead"],
+        http=http,  # type: ignore
+    )
+
+
+class ParseSitemapTest(unittest.TestCase):
+    def test_urlset(self):
+        sitemaps, urls = parse_sitemap((FIXTURES / "urlset.xml").read_bytes())
+        self.assertEqual(sitemaps, [])
+        self.assertEqual(
+            [u.loc.rsplit("/", 1)[-1] for u in urls],
+            ["published-in-window", "published-before-window", "edited-in-window", "undated"],
+        )
+        news = urls[0]
+        self.assertEqual(news.published, datetime(2024, 6, 10, 4, tzinfo=timezone.utc))
+        self.assertEqual(news.lastmod, datetime(2024, 6, 10, 12, 30, tzinfo=timezone.utc))
+        self.assertEqual(news.date, news.published)
+        self.assertEqual(news.title, "Man found dead in his flat")
+        self.assertEqual(urls[2].date, datetime(2024, 6, 10, 12, tzinfo=timezone.utc))
+        self.assertIsNone(urls[3].date)
+
+    def test_gzipped_urlset(self):
+        sitemaps, urls = parse_sitemap((FIXTURES / "urlset-2.xml.gz").read_bytes())
+        self.assertEqual(sitemaps, [])
+        self.assertEqual(
+            [(u.loc, u.lastmod) for u in urls],
+            [
+                ("https://example.com/news/gzipped-in-window", datetime(2024, 6, 11, 2, 30, tzinfo=timezone.utc)),
+                ("https://example.com/news/gzipped-after-window", datetime(2024, 6, 12, 8, tzinfo=timezone.utc)),
+            ],
+        )
+
+    def test_index(self):
+        sitemaps, urls = parse_sitemap((FIXTURES / "index.xml").read_bytes())
+        self.assertEqual(urls, [])
+        self.assertEqual(
+            [s.loc for s in sitemaps], [BASE + "index-2024.xml", BASE + "index-2019.xml"]
+        )
+
+
+class SitemapScraperTest(unittest.TestCase):
+    def test_discover(self):
+        http = FixtureHTTP()
+        entries = asyncio.run(scraper(http).discover())
+        self.assertEqual(
+            sorted(e.loc.rsplit("/", 1)[-1] for e in entries),
+            ["edited-in-window", "gzipped-in-window", "published-in-window", "undated"],
+        )
+        # the nested index is followed once, and the child last modified before the window is not fetched
+        self.assertEqual(
+            sorted(http.requested),
+            [BASE + "index-2024.xml", BASE + "index.xml", BASE + "urlset-2.xml.gz", BASE + "urlset.xml"],
+        )
+
+    def test_scrape_checks_the_article_date(self):
+        articles = asyncio.run(scraper(FixtureHTTP()).scrape())
+        self.assertEqual(
+            [a.url for a in articles], ["https://example.com/news/published-in-window"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
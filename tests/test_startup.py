@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("pytesseract", "PIL", "bs4", "googleapiclient", "playwright")
+"""Packages that only some scrapers or clouds need, so running another scraper must not import them."""
+
+
+def imported_modules(importtime: str) -> dict[str, int]:
+    """Return the cumulative import time in microseconds of every module in `python -X importtime` output."""
+    modules: dict[str, int] = {}
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class StartupTest(unittest.TestCase):
+    def test_dummy_scraper_imports_only_what_it_needs(self):
+        with tempfile.TemporaryDirectory() as cwd:  # the run writes its output to the working directory
+            env = os.environ | {
+                "PYTHONPATH": os.pathsep.join([str(ROOT), os.environ.get("PYTHONPATH", "")]),
+                "SIREN_CACHE_DIR": str(Path(cwd, ".siren")),
+            }
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-m", "siren", "--scraper", "dummy.DummyScraper"],
+                cwd=cwd,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=120,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+            # the scraper ran, from a working directory outside the repository
+            self.assertTrue(list(Path(cwd, "DummyScraper").rglob("*.csv.gz")))
+        # modules the registry loads with `importlib.import_module` are not listed by `-X importtime`,
+        # but everything they import with an `import` statement is
+        modules = imported_modules(result.stderr)
+        heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY)
+        self.assertEqual(heavy, [])
+        print(f"\nsiren imported in {modules['siren'] / 1000:.0f}ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()